@@ -173,16 +173,7 @@ class AfricanMindsBookLoader(BookLoader):
                 continue
 
             # contribution not in work, try to get contributor or create it
-            if orcid and orcid in self.all_contributors:
-                contributor_id = self.all_contributors[orcid]
-            elif full_name in self.all_contributors:
-                contributor_id = self.all_contributors[full_name]
-            else:
-                contributor_id = self.thoth.create_contributor(contributor)
-                # cache new contributor
-                self.all_contributors[full_name] = contributor_id
-                if orcid:
-                    self.all_contributors[orcid] = contributor_id
+            contributor_id = self.resolve_contributor(full_name, orcid, lambda: contributor)
 
             contribution = {
                 "workId": work.workId,
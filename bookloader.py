@@ -1,15 +1,29 @@
 """Load a CSV file into Thoth"""
 import re
+import functools
+import numpy as np
 import pandas as pd
 import isbn_hyphenate
-import json
+import ijson
+import orjson
 import pymarc
+import requests
 import roman
 import logging
+import os
 import sys
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from onix.book.v3_0.reference.strict import Onixmessage
 from xsdata.formats.dataclass.parsers import XmlParser
-from thothlibrary import ThothClient
+from thothlibrary import ThothClient, ThothError, ThothMutation
+from thothlibrary.errors import ResponseEmptyError
+from thothsession import SessionGraphQLClient
 
 
 class Deduper():  # pylint: disable=too-few-public-methods
@@ -26,6 +40,61 @@ class Deduper():  # pylint: disable=too-few-public-methods
         return "%s %d" % (header, self.headers[header])
 
 
+class NormalisedKeyDict(dict):
+    """Dictionary whose string keys, when not found exactly, are looked up ignoring case and spacing
+
+    Keys are stored as given, so names differing only in case (e.g. "de la Cruz" and "De La Cruz")
+    remain separate entries; the first one stored answers lookups matching neither exactly.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # first key stored under each normalised form
+        self.normalised_keys = {}
+        self.update(dict(*args, **kwargs))
+
+    @staticmethod
+    def normalise(key):
+        """Collapse runs of whitespace and fold case"""
+        if isinstance(key, str):
+            return " ".join(key.split()).casefold()
+        return key
+
+    def lookup_key(self, key):
+        """Return the stored key matching key exactly or, failing that, once normalised"""
+        if super().__contains__(key):
+            return key
+        return self.normalised_keys.get(self.normalise(key), key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.normalised_keys.setdefault(self.normalise(key), key)
+
+    def __getitem__(self, key):
+        return super().__getitem__(self.lookup_key(key))
+
+    def __contains__(self, key):
+        return super().__contains__(self.lookup_key(key))
+
+    def get(self, key, default=None):
+        return super().get(self.lookup_key(key), default)
+
+    def update(self, other):
+        for key, value in dict(other).items():
+            self[key] = value
+
+
+class BatchMutationError(ThothError):
+    """Error in a batch of mutations, some of which may have been written to Thoth regardless
+
+    results: result of each mutation in the batch, in order, or None if it isn't known to have been written
+    """
+
+    def __init__(self, request, response, results):
+        super().__init__(request, response)
+        self.results = results
+
+
 class BookLoader:
     """Generic logic to ingest metadata from CSV, MARCXML, ONIX, or JSON into Thoth"""
     allowed_formats = ["CSV", "MARCXML", "ONIX3", "JSON"]
@@ -38,11 +107,30 @@ class BookLoader:
     cache_institutions = True
     cache_series = False
     cache_issues = False
+    cache_works = False
+    # set once the publisher's works have all been cached: DOIs missing from all_works then have no work
+    works_prefetched = False
     cache_pagination_size = 20000
-    all_contributors = {}
+    # caches of Thoth records are only saved between runs when requested (see loader.py --persist-cache)
+    persist_cache = False
+    cache_file = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                              "thoth-loader", "cache.json")
+    max_workers = 1
+    # concurrent requests used to resolve DOIs to landing pages
+    doi_workers = 16
+    # maximum number of mutations sent in a single request when creating records in bulk
+    mutation_batch_size = 100
+    # contributors are cached by full name and, separately, by ORCID
+    all_contributors = NormalisedKeyDict()
+    all_contributor_orcids = {}
     all_institutions = {}
     all_series = {}
     all_issues = {}
+    all_works = {}
+    all_landing_pages = {}
+    # time each landing page was resolved: saved landing pages older than landing_page_ttl seconds are dropped
+    landing_page_times = {}
+    landing_page_ttl = 30 * 24 * 60 * 60
     encoding = "utf-8"
     header = 0
     separation = ","
@@ -119,6 +207,9 @@ class BookLoader:
         # A19 = "Afterword by"
         "A19": "CONTRIBUTIONS_BY",
     }
+    # contribution_types keyed ignoring case and spacing, for free-text roles
+    contribution_roles = NormalisedKeyDict()
+    contribution_roles.update(contribution_types)
     publication_types = {
         "BB": "HARDBACK",
         "BC": "PAPERBACK",
@@ -159,13 +250,26 @@ class BookLoader:
     int_regex = re.compile(r'\d+')
     audio_regex = re.compile(r'[0-9]{1,3} \(aud\)')
     video_regex = re.compile(r'[0-9]{1,3} \(vid\)')
+    page_string_regex = re.compile(r'\((?:(\w+), )?(\d+) pages\)')
 
     def __init__(self, metadata_file, client_url, email, password):
         if self.import_format not in self.allowed_formats:
             raise
         self.metadata_file = metadata_file
+        # guards the shared caches when records are processed concurrently: only held to read or update them
+        self.cache_lock = threading.RLock()
+        # one lock per record being looked up or created (see key_lock)
+        self.key_locks = {}
         self.thoth = ThothClient(client_url)
+        self.thoth.client = SessionGraphQLClient(self.thoth.graphql_endpoint)
         self.thoth.login(email, password)
+        # reuse connections to the DOI resolver across lookups, keeping one per concurrent lookup,
+        # and retry transient connection failures rather than aborting the run
+        self.doi_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.doi_workers, pool_maxsize=self.doi_workers,
+                              max_retries=Retry(total=3, backoff_factor=0.3))
+        self.doi_session.mount("https://", adapter)
+        self.doi_session.mount("http://", adapter)
 
         if self.import_format == "CSV":
             self.data = self.prepare_csv_file()
@@ -182,36 +286,62 @@ class BookLoader:
             # Publisher name may not be set at this point, which is OK
             pass
 
+        # with persist_cache, caches of contributors, institutions and series are reused from
+        # a previous run when the records of that type haven't changed since (see load_cache)
         if self.cache_contributors:
             # create cache of all existing contributors using pagination
-            for offset in range(0, self.thoth.contributor_count(), self.cache_pagination_size):
-                for c in self.thoth.contributors(limit=self.cache_pagination_size, offset=offset):
-                    self.all_contributors[c.fullName] = c.contributorId
-                    if c.orcid:
-                        self.all_contributors[c.orcid] = c.contributorId
+            def add_contributors(limit, offset):
+                contributors = self.thoth.contributors(limit=limit, offset=offset)
+                for c in contributors:
+                    self.cache_contributor(c.contributorId, c.fullName, c.orcid)
+                return self.newest_update_in(contributors)
+            self.load_cache("contributors", (self.all_contributors, self.all_contributor_orcids),
+                            self.thoth.contributor_count(), add_contributors)
         if self.cache_institutions:
             # create cache of all existing institutions using pagination
-            for offset in range(0, self.thoth.institution_count(), self.cache_pagination_size):
-                for i in self.thoth.institutions(limit=self.cache_pagination_size, offset=offset):
+            def add_institutions(limit, offset):
+                institutions = self.thoth.institutions(limit=limit, offset=offset)
+                for i in institutions:
                     self.all_institutions[i.institutionName] = i.institutionId
                     if i.ror:
                         self.all_institutions[i.ror] = i.institutionId
+                return self.newest_update_in(institutions)
+            self.load_cache("institutions", (self.all_institutions,),
+                            self.thoth.institution_count(), add_institutions)
         if self.cache_series:
             # create cache of all existing series using pagination
-            for offset in range(0, self.thoth.series_count(), self.cache_pagination_size):
-                for series in self.thoth.serieses(limit=self.cache_pagination_size, offset=offset):
+            def add_series(limit, offset):
+                serieses = self.thoth.serieses(limit=limit, offset=offset)
+                for series in serieses:
                     self.all_series[series.seriesName] = series.seriesId
+                return self.newest_update_in(serieses)
+            self.load_cache("serieses", (self.all_series,),
+                            self.thoth.series_count(), add_series)
         if self.cache_issues:
             # create cache of all existing issues using pagination
             for offset in range(0, self.thoth.issue_count(), self.cache_pagination_size):
                 for issue in self.thoth.issues(limit=self.cache_pagination_size, offset=offset):
                     self.all_issues[issue.work.workId] = issue.issueId
+        if self.cache_works:
+            self.cache_publisher_works()
+
+    def cache_publisher_works(self):
+        """Add the current publisher's existing works to the cache of works, keyed by DOI, using pagination"""
+        publishers = f'"{self.publisher_id}"'
+        for offset in range(0, self.thoth.work_count(publishers=publishers), self.cache_pagination_size):
+            for work in self.thoth.works(limit=self.cache_pagination_size, offset=offset,
+                                         publishers=publishers):
+                if work.doi:
+                    self.all_works[work.doi] = work.workId
+        self.works_prefetched = True
 
     def prepare_csv_file(self):
         """Read CSV, convert empties to None and rename duplicate columns"""
         frame = pd.read_csv(self.metadata_file, encoding=self.encoding,
                             header=self.header, sep=self.separation)
         frame = frame.where(pd.notnull(frame), None)
+        # where() leaves NaN in numeric columns: convert those too, once for the whole file
+        frame = frame.replace({np.nan: None})
         frame = frame.rename(columns=Deduper())
         return frame
 
@@ -227,10 +357,303 @@ class BookLoader:
         return message
 
     def prepare_json_file(self):
-        """Read JSON"""
-        with open(self.metadata_file) as raw_json:
-            prepared_json = json.load(raw_json)
-        return prepared_json
+        """Read JSON, yielding the records of its top-level array one at a time"""
+        with open(self.metadata_file, "rb") as raw_json:
+            yield from ijson.items(raw_json, "item", use_float=True)
+
+    def load_cache(self, name, caches, count, add_page):
+        """Fill caches from the copy saved by a previous run, or else page through Thoth and save them
+
+        A saved copy is only reused if Thoth holds as many records as when it was saved and its most
+        recently updated record hasn't changed since, so that renamed, merged or recreated records are seen.
+
+        name: name of the Thoth query listing the records, e.g. "contributors"
+
+        caches: tuple of dictionaries to fill
+
+        count: number of records currently held in Thoth
+
+        add_page: function adding one page of records, given a limit and offset, to caches
+                  and returning the latest updatedAt among them
+        """
+        if self.persist_cache:
+            newest_update = self.newest_update(name)
+            if newest_update is None:
+                logging.warning("Could not check whether the saved %s cache is up to date, rebuilding it", name)
+            else:
+                saved = self.read_cache_file(name, [count, newest_update])
+                if isinstance(saved, list) and len(saved) == len(caches):
+                    for cache, entries in zip(caches, saved):
+                        cache.update(entries)
+                    return
+            # fetch each record's updatedAt along with it, to save with the rebuilt cache
+            fields = self.thoth.QUERIES[name]["fields"]
+            if "updatedAt" not in fields:
+                fields.append("updatedAt")
+        page_updates = [add_page(self.cache_pagination_size, offset)
+                        for offset in range(0, count, self.cache_pagination_size)]
+        newest_update = max(filter(None, page_updates), default=None)
+        self.write_cache_file(name, [count, newest_update], list(caches))
+
+    def newest_update(self, name):
+        """Return the latest updatedAt of the records listed by a Thoth query, or None if it can't be found
+
+        name: name of the Thoth query, e.g. "contributors"
+        """
+        request = "query { %s(limit: 1, order: {field: UPDATED_AT, direction: DESC}) { updatedAt } }" % name
+        try:
+            return orjson.loads(self.thoth.client.execute(request))["data"][name][0]["updatedAt"]
+        except (KeyError, IndexError, TypeError, ValueError, ThothError, requests.RequestException):
+            return None
+
+    @staticmethod
+    def newest_update_in(records):
+        """Return the latest updatedAt among records returned by Thoth, or None if they don't include it
+
+        records: list of records, e.g. contributors
+        """
+        # Thoth's timestamps share one format, so they sort as strings
+        return max(filter(None, (getattr(record, "updatedAt", None) for record in records)), default=None)
+
+    def read_cache_file(self, name, marker):
+        """Return a cache saved by a previous run, or None if missing or out of date
+
+        name: name of the cache, e.g. "contributors"
+
+        marker: state of the records in Thoth when the cache is valid, compared with the one saved
+        """
+        if not self.persist_cache:
+            return None
+        try:
+            with open(self.cache_file, "rb") as cache_file:
+                saved = orjson.loads(cache_file.read())[self.thoth.graphql_endpoint][name]
+            if saved["marker"] != marker:
+                return None
+            return saved["entries"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def write_cache_file(self, name, marker, entries):
+        """Save a cache for reuse by the next run against the same Thoth instance
+
+        name: name of the cache, e.g. "contributors"
+
+        marker: state of the records in Thoth when the cache was built, e.g. their count
+
+        entries: list of dictionaries to save
+        """
+        if not self.persist_cache:
+            return
+        try:
+            with open(self.cache_file, "rb") as cache_file:
+                saved = orjson.loads(cache_file.read())
+        except (OSError, ValueError):
+            saved = {}
+        saved.setdefault(self.thoth.graphql_endpoint, {})[name] = {"marker": marker, "entries": entries}
+        try:
+            # the cache holds names and ORCIDs: keep it in a directory only the current user can read
+            os.makedirs(os.path.dirname(self.cache_file), mode=0o700, exist_ok=True)
+            # write to a temporary file first so an interrupted run can't leave a truncated cache
+            temporary_file = f"{self.cache_file}.{os.getpid()}"
+            with open(temporary_file, "wb") as cache_file:
+                cache_file.write(orjson.dumps(saved))
+            os.replace(temporary_file, self.cache_file)
+        except OSError as e:
+            logging.warning("Could not save %s cache: %s", name, e)
+
+    @contextmanager
+    def key_lock(self, *keys):
+        """Hold a lock for each key while a record is looked up and, if missing, created in Thoth,
+        so that records are only created once without blocking work on other records
+
+        keys: hashable keys identifying the record, e.g. ("doi", doi); None values are ignored
+        """
+        with self.cache_lock:
+            # always acquire in the same order, so two records sharing several keys can't deadlock
+            locks = [self.key_locks.setdefault(key, threading.Lock())
+                     for key in sorted({key for key in keys if key is not None}, key=repr)]
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def contributor_lock(self, full_name, orcid=None):
+        """Hold the locks of a contributor's name and ORCID (see key_lock)
+
+        full_name: contributor's full name
+
+        orcid: contributor's ORCID, if known
+        """
+        return self.key_lock(("contributor", NormalisedKeyDict.normalise(full_name)),
+                             ("orcid", orcid) if orcid else None)
+
+    def find_contributor(self, full_name, orcid=None):
+        """Return the ID of a cached contributor, matching on ORCID before name, or None
+
+        full_name: contributor's full name
+
+        orcid: contributor's ORCID, if known
+        """
+        return (orcid and self.all_contributor_orcids.get(orcid)) or self.all_contributors.get(full_name)
+
+    def cache_contributor(self, contributor_id, full_name, orcid=None):
+        """Add a contributor to the name and ORCID caches
+
+        contributor_id: ID of the contributor in Thoth
+
+        full_name: contributor's full name
+
+        orcid: contributor's ORCID, if known
+        """
+        self.all_contributors[full_name] = contributor_id
+        if orcid:
+            self.all_contributor_orcids[orcid] = contributor_id
+
+    def resolve_contributor(self, full_name, orcid, new_contributor):
+        """Return the ID of a contributor, creating and caching it if it isn't known yet
+
+        full_name: contributor's full name
+
+        orcid: contributor's ORCID, if known
+
+        new_contributor: function returning the contributor to create when there is no match
+        """
+        with self.contributor_lock(full_name, orcid):
+            with self.cache_lock:
+                contributor_id = self.find_contributor(full_name, orcid)
+            if contributor_id is None:
+                contributor_id = self.thoth.create_contributor(new_contributor())
+                with self.cache_lock:
+                    self.cache_contributor(contributor_id, full_name, orcid)
+        return contributor_id
+
+    def create_missing_contributors(self, contributors):
+        """Create, in batched requests, every contributor not found in the caches, and cache them
+
+        contributors: iterable of contributor dictionaries, as expected by createContributor
+        """
+        missing = NormalisedKeyDict()
+        for contributor in contributors:
+            full_name = contributor["fullName"]
+            if full_name not in missing and self.find_contributor(full_name, contributor["orcid"]) is None:
+                missing[full_name] = contributor
+        missing = list(missing.values())
+        for start in range(0, len(missing), self.mutation_batch_size):
+            batch = missing[start:start + self.mutation_batch_size]
+            contributor_ids = self.mutate_batch([("createContributor", contributor) for contributor in batch])
+            for contributor, contributor_id in zip(batch, contributor_ids):
+                self.cache_contributor(contributor_id, contributor["fullName"], contributor["orcid"])
+
+    def process_records(self, records, process_record):
+        """Call process_record on every record, running up to max_workers at a time
+
+        records: iterable of records from the metadata file
+
+        process_record: method ingesting a single record
+        """
+        if self.max_workers <= 1:
+            for record in records:
+                process_record(record)
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            for record in records:
+                # keep a bounded number of records in flight
+                if len(pending) >= self.max_workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        # re-raise any error from the worker thread
+                        future.result()
+                pending.add(executor.submit(process_record, record))
+            for future in wait(pending).done:
+                future.result()
+
+    def resolve_doi(self, doi):
+        """Return the URL a DOI resolves to, following redirects without downloading the page
+
+        doi: full DOI URL
+        """
+        # each DOI is resolved at most once per run
+        landing_page = self.all_landing_pages.get(doi)
+        if landing_page is None:
+            # a GET, as some publisher sites refuse HEAD requests or redirect them elsewhere;
+            # streamed, so that only the headers are read before the connection is closed
+            with self.doi_session.get(doi, allow_redirects=True, timeout=30, stream=True) as response:
+                landing_page = response.url
+            if response.ok:
+                self.all_landing_pages[doi] = landing_page
+                self.landing_page_times[doi] = time.time()
+            else:
+                # don't keep error pages: the DOI is resolved again the next time it is needed
+                logging.warning("DOI %s resolved to %s with status %s", doi, landing_page, response.status_code)
+        return landing_page
+
+    def resolve_dois(self, dois):
+        """Resolve several DOIs concurrently and return a dictionary of DOI to landing page
+
+        dois: iterable of full DOI URLs
+        """
+        dois = set(dois)
+        if not self.all_landing_pages:
+            # reuse landing pages resolved by recent runs, saved alongside the Thoth caches
+            saved = self.read_cache_file("landing_pages", None)
+            if isinstance(saved, list) and len(saved) == 2:
+                (landing_pages, resolved_times) = saved
+                expiry = time.time() - self.landing_page_ttl
+                for doi, resolved_time in resolved_times.items():
+                    if resolved_time > expiry and doi in landing_pages:
+                        self.all_landing_pages[doi] = landing_pages[doi]
+                        self.landing_page_times[doi] = resolved_time
+        unresolved = [doi for doi in dois if doi not in self.all_landing_pages]
+        landing_pages = {doi: self.all_landing_pages[doi] for doi in dois.difference(unresolved)}
+        if unresolved:
+            with ThreadPoolExecutor(max_workers=self.doi_workers) as executor:
+                # resolve_doi adds each successful result to the cache
+                landing_pages.update(zip(unresolved, executor.map(self.resolve_doi, unresolved)))
+            self.write_cache_file("landing_pages", None, [self.all_landing_pages, self.landing_page_times])
+        return landing_pages
+
+    def mutate_batch(self, mutations):
+        """Run several mutations in a single GraphQL request and return their results in order
+
+        Raises BatchMutationError, holding the results of any mutations written, if one of them fails.
+
+        mutations: list of (mutation name, data) tuples, e.g. ("createSubject", subject)
+        """
+        if not mutations:
+            return []
+        prepared = [ThothMutation(mutation_name, data, True) for mutation_name, data in mutations]
+        # alias each mutation so that repeated mutation names don't clash in the response
+        request = "mutation {\n%s\n}" % "\n".join(
+            "m%d: %s(data: {%s}) { %s }" % (index, mutation.mutation_name, mutation.data_str, mutation.return_value)
+            for index, mutation in enumerate(prepared))
+        # as in ThothClient.mutation, retry when Thoth returns an empty response
+        max_retries = 2
+        for attempt in range(max_retries + 1):
+            result = self.thoth.client.execute(request)
+            if result:
+                break
+            if attempt == max_retries:
+                raise ResponseEmptyError(request, "None")
+        try:
+            serialised = orjson.loads(result)
+            data = serialised.get("data") or {}
+            results = [(data.get("m%d" % index) or {}).get(mutation.return_value)
+                       for index, mutation in enumerate(prepared)]
+        except (AttributeError, TypeError, ValueError):
+            raise ThothError(request, result)
+        if "errors" in serialised or None in results:
+            # the batch isn't atomic: report what was written so that the caller can skip or remove it
+            written = ["m%d" % index for index, value in enumerate(results) if value is not None]
+            failed = [str(error["path"][0]) for error in serialised.get("errors") or []
+                      if isinstance(error, dict) and error.get("path")]
+            logging.error("Batch of %d mutations failed at %s, written: %s",
+                          len(prepared), ", ".join(failed) or "unknown", ", ".join(written) or "none")
+            raise BatchMutationError(request, result, results)
+        return results
 
     def create_publisher(self):
         """Create a publisher object in Thoth and return its ID"""
@@ -273,10 +696,19 @@ class BookLoader:
             if contribution_type in self.main_contributions \
             else "false"
 
+    def get_contribution_type(self, role):
+        """Return the contribution type of a free-text role, or None if it isn't recognised
+
+        role: contributor role as found in the metadata, e.g. "Editor." or " author,"
+        """
+        if not role:
+            return None
+        return self.contribution_roles.get(role.strip().rstrip(",."))
+
     def check_update_contributor(self, contributor, contributor_id):
         # find existing contributor in Thoth
         contributor_record = self.thoth.contributor(contributor_id, True)
-        thoth_contributor = json.loads(contributor_record)['data']['contributor']
+        thoth_contributor = orjson.loads(contributor_record)['data']['contributor']
         # remove unnecessary fields for comparison to contributor
         del thoth_contributor['__typename']
         del thoth_contributor['contributions']
@@ -297,9 +729,9 @@ class BookLoader:
             # so only update if combined_contributor is different from thoth_contributor
             if combined_contributor != thoth_contributor:
                 self.thoth.update_contributor(combined_contributor)
-                logging.info(f"updated contributor: {contributor_id}")
+                logging.info("updated contributor: %s", contributor_id)
         else:
-            logging.info(f"existing contributor, no changes needed to Thoth: {contributor_id}")
+            logging.info("existing contributor, no changes needed to Thoth: %s", contributor_id)
         return contributor
 
     def get_book_by_title(self, title):
@@ -321,6 +753,52 @@ class BookLoader:
         }
         return self.thoth.create_work_relation(work_relation)
 
+    def find_work_id(self, doi):
+        """Return the ID of the work with the given DOI, or None if it isn't in Thoth
+
+        Works found are remembered in all_works, so each DOI is only queried once. Once the publisher's
+        works have been prefetched (see cache_publisher_works), a DOI missing from all_works is known
+        to be new and Thoth isn't queried at all.
+
+        doi: DOI of the work
+        """
+        if not doi:
+            return None
+        with self.cache_lock:
+            work_id = self.all_works.get(doi)
+        if work_id is None and not self.works_prefetched:
+            try:
+                work_id = self.thoth.work_by_doi(doi).workId
+            except (IndexError, AttributeError, ThothError):
+                return None
+            with self.cache_lock:
+                self.all_works[doi] = work_id
+        return work_id
+
+    @staticmethod
+    def merge_work(existing_work, work):
+        """Copy the non-empty values of work onto existing_work and return whether any of them differed
+
+        existing_work: work as returned by Thoth
+
+        work: dictionary of new values
+        """
+        changes = {k: v for k, v in work.items() if v is not None and existing_work.get(k) != v}
+        existing_work.update(changes)
+        return bool(changes)
+
+    @staticmethod
+    def created_work(work, work_id):
+        """Return a newly created work shaped like work_by_id's result, without fetching it back
+
+        work: dictionary the work was created from
+
+        work_id: ID returned by create_work
+        """
+        # a new work has no related records yet
+        return SimpleNamespace(**work, workId=work_id, contributions=[], publications=[],
+                               languages=[], subjects=[], relations=[], issues=[], fundings=[])
+
     @staticmethod
     def get_work_contributions(work):
         work_contributions = {}
@@ -350,6 +828,16 @@ class BookLoader:
             title = full_title
         return {"title": title, "subtitle": subtitle, "fullTitle": full_title}
 
+    @staticmethod
+    def split_name(name):
+        """Return (first name, last name, full name) from a 'Surname, Given names' string"""
+        parts = name.split(",", 1)
+        surname = parts[0].strip()
+        if len(parts) == 1:
+            return None, surname, surname
+        given_name = parts[1].strip()
+        return given_name, surname, f"{given_name} {surname}"
+
     @staticmethod
     def in_to_mm(inches):
         """Return a rounded conversion to milimetres from inches"""
@@ -359,6 +847,7 @@ class BookLoader:
             return None
 
     @staticmethod
+    @functools.lru_cache(maxsize=8192)
     def sanitise_date(date):
         """Return a date ready to be ingested"""
         if not date:
@@ -371,6 +860,7 @@ class BookLoader:
         return date.replace("/", "-").strip()
 
     @staticmethod
+    @functools.lru_cache(maxsize=8192)
     def sanitise_isbn(isbn):
         """Return a hyphenated ISBN"""
         if not isbn:
@@ -409,7 +899,7 @@ class BookLoader:
         if url.startswith("https://"):
             return url
         else:
-            return "https://{}".format(url)
+            return f"https://{url}"
 
     @staticmethod
     def sanitise_doi(doi):
@@ -427,18 +917,19 @@ class BookLoader:
         return BookLoader.sanitise_identifier(ror, "ror")
 
     @staticmethod
+    @functools.lru_cache(maxsize=16384)
     def sanitise_identifier(identifier, domain):
         """Return an identifier beginning https://{domain}.org/"""
         if not identifier:
             return None
-        if identifier.startswith("https://{}.org/".format(domain)):
+        if identifier.startswith(f"https://{domain}.org/"):
             return identifier
-        elif identifier.startswith("http://{}.org/".format(domain)):
+        elif identifier.startswith(f"http://{domain}.org/"):
             return identifier.replace("http://", "https://")
-        elif identifier.startswith("{}.org/".format(domain)):
+        elif identifier.startswith(f"{domain}.org/"):
             return BookLoader.sanitise_url(identifier)
         else:
-            return "https://{}.org/{}".format(domain, identifier)
+            return f"https://{domain}.org/{identifier}"
 
     @staticmethod
     def sanitise_price(price):
@@ -475,6 +966,14 @@ class BookLoader:
             audio_count = 0
         return audio_count, video_count
 
+    @staticmethod
+    def sanitise_int(value):
+        """Return an integer, or None if the value can't be converted"""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
     @staticmethod
     def sanitise_string(string):
         return string.replace('\n', '').replace('\r', '').strip()
@@ -482,7 +981,7 @@ class BookLoader:
     @staticmethod
     def parse_page_string(page_string):
         """Return the number of pages and page breakdown from MARC 300 fields"""
-        matches = re.search(r'\((?:(\w+), )?(\d+) pages\)', page_string)
+        matches = BookLoader.page_string_regex.search(page_string)
         if matches:
             roman_numeral = matches.group(1)
             page_number = int(matches.group(2))
@@ -7,6 +7,7 @@ import numpy as np
 import pandas as pd
 import logging
 from thothlibrary import ThothClient
+from thothsession import SessionGraphQLClient
 
 
 class Deduper:  # pylint: disable=too-few-public-methods
@@ -42,6 +43,7 @@ class ChapterLoader:
     def __init__(self, metadata_file, client_url, email, password):
         self.metadata_file = metadata_file
         self.thoth = ThothClient(client_url)
+        self.thoth.client = SessionGraphQLClient(self.thoth.graphql_endpoint)
         self.thoth.login(email, password)
 
         self.data = self.prepare_file()
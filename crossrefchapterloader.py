@@ -5,6 +5,7 @@ import sys
 
 import logging
 import thothlibrary
+from thothsession import SessionGraphQLClient
 from crossref import CrossrefClient
 
 
@@ -23,6 +24,7 @@ class CrossrefChapterLoader:
 
     def __init__(self, metadata_file, client_url, email, password):
         self.thoth = thothlibrary.ThothClient(client_url)
+        self.thoth.client = SessionGraphQLClient(self.thoth.graphql_endpoint)
         self.thoth.login(email, password)
         self.crossref = CrossrefClient()
 
@@ -2,8 +2,6 @@
 """Load Leuven University Press metadata into Thoth"""
 
 import logging
-import requests
-import itertools
 from bookloader import BookLoader
 from onix3 import Onix3Record
 
@@ -21,12 +19,14 @@ class LeuvenLoader(BookLoader):
     def run(self):
         """Process ONIX and call Thoth to insert its data"""
         default_language = self.data.header.default_language_of_text.value.value.upper()
+        records = [Onix3Record(product) for product in self.data.no_product_or_product]
+        # resolve DOIs of works lacking a landing page concurrently, before the sequential loop
+        self.resolve_dois(doi for doi in map(self.get_fallback_doi, records) if doi)
         issues_to_create = []
-        for product in self.data.no_product_or_product:
-            record = Onix3Record(product)
+        for record in records:
             work = self.get_work(record)
             work_id = self.thoth.create_work(work)
-            logging.info('workId: %s' % work_id)
+            logging.info("workId: %s", work_id)
             self.create_publications(record, work_id)
             self.create_contributors(record, work_id)
             self.create_languages(record, work_id, default_language)
@@ -36,6 +36,19 @@ class LeuvenLoader(BookLoader):
                 self.extract_issues_data(record, work_id))
         self.create_all_issues(issues_to_create)
 
+    @staticmethod
+    def get_fallback_doi(record):
+        """Returns the DOI of a record with no landing page, which must be resolved to obtain one
+
+        record: current onix record
+        """
+        if record.available_content_url() is not None:
+            return None
+        try:
+            return record.doi()
+        except IndexError:
+            return None
+
     def get_work(self, record):
         """Returns a dictionary with all attributes of a 'work'
 
@@ -52,7 +65,7 @@ class LeuvenLoader(BookLoader):
         if landing_page is None and doi is not None:
             # Backstop: resolve DOI to obtain landing page
             # (this takes some time and is not always accurate)
-            landing_page = requests.get(doi).url
+            landing_page = self.resolve_doi(doi)
 
         edition = record.edition_number()
         if edition is None:
@@ -228,23 +241,13 @@ class LeuvenLoader(BookLoader):
             full_name = Onix3Record.get_person_name(contributor_record)
             orcid = Onix3Record.get_orcid(contributor_record)
 
-            if orcid and orcid in self.all_contributors:
-                contributor_id = self.all_contributors[orcid]
-            elif full_name in self.all_contributors:
-                contributor_id = self.all_contributors[full_name]
-            else:
-                contributor = {
-                    "firstName": given_name,
-                    "lastName": family_name,
-                    "fullName": full_name,
-                    "orcid": orcid,
-                    "website": None,
-                }
-                contributor_id = self.thoth.create_contributor(contributor)
-                # cache new contributor
-                self.all_contributors[full_name] = contributor_id
-                if orcid:
-                    self.all_contributors[orcid] = contributor_id
+            contributor_id = self.resolve_contributor(full_name, orcid, lambda: {
+                "firstName": given_name,
+                "lastName": family_name,
+                "fullName": full_name,
+                "orcid": orcid,
+                "website": None,
+            })
 
             contribution = {
                 "workId": work_id,
@@ -348,12 +351,12 @@ class LeuvenLoader(BookLoader):
 
         issues_to_create: list of dicts representing issues to create
         """
-        sorted_issues = sorted(issues_to_create, key=lambda x: x['series_id'])
-        grouped_issues = []
-        for key, group in itertools.groupby(sorted_issues, key=lambda x: x['series_id']):
-            grouped_issues.append(list(group))
+        # bucket issues by series in a single pass (no sort needed just to group them)
+        grouped_issues = {}
+        for issue_data in issues_to_create:
+            grouped_issues.setdefault(issue_data['series_id'], []).append(issue_data)
 
-        for issue_list in grouped_issues:
+        for issue_list in grouped_issues.values():
             # Sorts issues in same series by ordinal, pushing Nones to start of list
             # Retains series order but avoids problems with missing/clashing ordinals
             sorted_list = sorted(issue_list, key=lambda x: (
@@ -367,4 +370,4 @@ class LeuvenLoader(BookLoader):
                 try:
                     self.thoth.create_issue(issue)
                 except Exception as e:
-                    logging.error(f"{e} ({issue_data['work_id']})")
+                    logging.error("%s (%s)", e, issue_data["work_id"])
@@ -6,6 +6,8 @@ Call custom, business specific, workflows to ingest metadata into Thoth.
 
 import argparse
 import logging
+import os
+from bookloader import BookLoader
 from obploader import OBPBookLoader
 from obpchapterloader import ObpChapterLoader
 from obpchapterabstractloader import ObpChapterAbstractLoader
@@ -76,13 +78,39 @@ ARGS = [
         "default": "OBP",
         "help": "Publisher key, one of: {}".format(
             ', '.join("%s" % (key) for (key, val) in LOADERS.items()))
+    }, {
+        "val": "--workers",
+        "dest": "workers",
+        "action": "store",
+        "default": "1",
+        "help": "Number of records to process concurrently (where supported)"
+    }, {
+        "val": "--refresh-cache",
+        "dest": "refresh_cache",
+        "action": "store_true",
+        "default": False,
+        "help": "Ignore contributor/institution/series and DOI landing page caches saved by previous runs"
+    }, {
+        "val": "--persist-cache",
+        "dest": "persist_cache",
+        "action": "store_true",
+        "default": False,
+        "help": "Save contributor/institution/series and DOI landing page caches for reuse by later runs. "
+                "Saved caches are only checked against Thoth's record counts, so use --refresh-cache "
+                "after records have been edited or merged"
     }
 ]
 
 
-def run(mode, metadata_file, client_url, email, password):
+def run(mode, metadata_file, client_url, email, password, workers=1, refresh_cache=False,
+        persist_cache=False):
     """Execute a book loader based on input parameters"""
+    if refresh_cache and os.path.exists(BookLoader.cache_file):
+        os.remove(BookLoader.cache_file)
+    # caches are filled when the loader is created, so this must be set beforehand
+    BookLoader.persist_cache = persist_cache
     loader = LOADERS[mode](metadata_file, client_url, email, password)
+    loader.max_workers = int(workers)
     loader.run()
 
 
@@ -106,5 +134,6 @@ if __name__ == '__main__':
                         format='%(levelname)s:%(asctime)s: %(message)s')
     ARGUMENTS = get_arguments()
     run(ARGUMENTS.mode, ARGUMENTS.file, ARGUMENTS.client_url,
-        ARGUMENTS.email, ARGUMENTS.password)
+        ARGUMENTS.email, ARGUMENTS.password, ARGUMENTS.workers,
+        ARGUMENTS.refresh_cache, ARGUMENTS.persist_cache)
 
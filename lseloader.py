@@ -2,7 +2,6 @@
 """Load LSE Press metadata into Thoth"""
 
 import logging
-import requests
 from urllib.parse import urlparse
 from bookloader import BookLoader
 from onix3 import Onix3Record
@@ -19,19 +18,20 @@ class LSELoader(BookLoader):
 
     def run(self):
         """Process ONIX and call Thoth to insert its data"""
-        for product in self.data.no_product_or_product:
-            record = Onix3Record(product)
+        records = [Onix3Record(product) for product in self.data.no_product_or_product]
+        # resolve every DOI to its landing page concurrently, before the sequential loop
+        self.resolve_dois(record.doi() for record in records)
+        for record in records:
             work = self.get_work(record, self.imprint_id)
             logging.info(work)
             work_id = self.thoth.create_work(work)
-            logging.info('workId: %s' % work_id)
+            logging.info("workId: %s", work_id)
             self.create_publications(record, work_id)
             self.create_contributors(record, work_id)
             self.create_languages(record, work_id)
             self.create_subjects(record, work_id)
 
-    @staticmethod
-    def get_work(record, imprint_id):
+    def get_work(self, record, imprint_id):
         """Returns a dictionary with all attributes of a 'work'
 
         record: current onix record
@@ -42,7 +42,7 @@ class LSELoader(BookLoader):
         doi = record.doi()
 
         # resolve DOI to obtain landing page
-        landing_page = requests.get(doi).url
+        landing_page = self.resolve_doi(doi)
 
         work = {
             "workType": record.work_type(),
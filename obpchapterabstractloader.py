@@ -7,6 +7,7 @@ import pandas as pd
 import logging
 
 import thothlibrary
+from thothsession import SessionGraphQLClient
 from thothlibrary import ThothClient
 
 from crossrefchapterloader import CrossrefChapterLoader
@@ -35,6 +36,7 @@ class ObpChapterAbstractLoader:
     def __init__(self, metadata_file, client_url, email, password):
         self.metadata_file = metadata_file
         self.thoth = ThothClient(client_url)
+        self.thoth.client = SessionGraphQLClient(self.thoth.graphql_endpoint)
         self.thoth.login(email, password)
 
         self.data = self.prepare_file()
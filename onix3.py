@@ -9,6 +9,8 @@ from bookloader import BookLoader
 
 class Onix3Record:
     """Generic logic to extract data from an ONIX 3.0 product record"""
+    # one wrapper is created per product in the file: avoid a __dict__ on each
+    __slots__ = ("_product",)
 
     def __init__(self, product: Product):
         self._product = product
@@ -24,7 +26,7 @@ class Onix3Record:
         try:
             return f"https://doi.org/{dois[0]}"
         except IndexError:
-            logging.error(f"No DOI found: {self._product.record_reference}")
+            logging.error("No DOI found: %s", self._product.record_reference)
             raise
 
     def isbn(self):
@@ -1,8 +1,8 @@
 #!/usr/bin/env python
 """Load SciELO metadata into Thoth"""
 
-import json
 import logging
+import orjson
 import sys
 import re
 import roman
@@ -17,6 +17,7 @@ class SciELOLoader(BookLoader):
     cache_institutions = False
     cache_series = True
     cache_issues = True
+    books_url_regex = re.compile(r"https://books\.scielo\.org/id/.{5}")
 
     def create_contributors(self, record, work):
         """Creates/updates all contributors associated with the current work and their contributions
@@ -26,28 +27,29 @@ class SciELOLoader(BookLoader):
         work: Work from Thoth
         """
         highest_contribution_ordinal = max((c.contributionOrdinal for c in work.contributions), default=0)
+        contributions_by_contributor = {c.contributor.contributorId: c for c in work.contributions}
+        contributions = []
         for creator in record["creators"]:
             orcid_id = None
             website = None
 
             # creator JSON structure: [["role", value], ["full_name", value], ["link_resume", value]]
+            role, creator_name, profile_link = creator[0][1], creator[1][1], creator[2][1]
             # sometimes JSON contains creator "role" information, but
             # no "full_name". Only create a contributor if "full_name" is not null.
-            if creator[1][1]:
+            if creator_name:
                 # JSON "full_name" most commonly contains a comma separating surname and name
                 # e.g. "Quevedo-Blasco, Raúl"
-                if ',' in creator[1][1]:
-                    full_name_inverted = creator[1][1].split(',')
-                    name = full_name_inverted[1].strip()
-                    surname = full_name_inverted[0]
+                if ',' in creator_name:
+                    surname, _, name = creator_name.partition(',')
+                    name = name.strip()
                     full_name = f"{name} {surname}"
                 # sometimes JSON "full_name" field contains an institution name,
                 # e.g. "Universidad de Granada". In this case, institution name is assigned to name, surname, and full_name
                 # which are all required fields.
                 else:
-                    name = surname = full_name = creator[1][1]
-                contribution_type = self.contribution_types[creator[0][1]]
-                profile_link = creator[2][1]
+                    name = surname = full_name = creator_name
+                contribution_type = self.contribution_types[role]
                 # profile_link (link_resume in JSON) may contain either an ORCID or a profile website
                 # assign value to orcid_id or website accordingly
                 if profile_link:
@@ -65,29 +67,26 @@ class SciELOLoader(BookLoader):
                     "orcid": orcid_id,
                     "website": website,
                 }
-                # determine the identifier to use (prefer ORCID if available)
-                # to check if contributor is already in Thoth
-                identifier = orcid_id if orcid_id else full_name
-
-                # check if the contributor is in Thoth
-                if identifier not in self.all_contributors:
-                    # if not in Thoth, create a new contributor
-                    contributor_id = self.thoth.create_contributor(contributor)
-                    logging.info(f"created contributor: {contributor_id}")
-                    # add new contributor to all_contributors cache
-                    self.all_contributors[full_name] = contributor_id
-                    if orcid_id:
-                        self.all_contributors[orcid_id] = contributor_id
-                else:
-                    # if contributor is in Thoth, get the contributor_id and run
-                    # update_scielo_contributor to check if any values need to be updated
-                    contributor_id = self.all_contributors[identifier]
-                    self.update_scielo_contributor(contributor, contributor_id)
-
-                existing_contribution = next(
-                    (c for c in work.contributions if c.contributor.contributorId == contributor_id),
-                    None
-                )
+                with self.contributor_lock(full_name, orcid_id):
+                    # check if the contributor is in Thoth, by ORCID if available
+                    with self.cache_lock:
+                        if orcid_id:
+                            contributor_id = self.all_contributor_orcids.get(orcid_id)
+                        else:
+                            contributor_id = self.all_contributors.get(full_name)
+                    if contributor_id is None:
+                        # if not in Thoth, create a new contributor
+                        contributor_id = self.thoth.create_contributor(contributor)
+                        logging.info("created contributor: %s", contributor_id)
+                        # add new contributor to the contributor caches
+                        with self.cache_lock:
+                            self.cache_contributor(contributor_id, full_name, orcid_id)
+                    else:
+                        # if contributor is in Thoth, run update_scielo_contributor
+                        # to check if any values need to be updated
+                        self.update_scielo_contributor(contributor, contributor_id)
+
+                existing_contribution = contributions_by_contributor.get(contributor_id)
                 if not existing_contribution:
                     contribution = {
                         "workId": work.workId,
@@ -100,16 +99,18 @@ class SciELOLoader(BookLoader):
                         "lastName": surname,
                         "fullName": full_name,
                     }
-                    self.thoth.create_contribution(contribution)
-                    logging.info(f"created contribution with contributorId: {contributor_id}")
+                    contributions.append(contribution)
                     highest_contribution_ordinal += 1
                 else:
-                    logging.info(f"existing contribution with contributorId: {contributor_id}, did not update")
+                    logging.info("existing contribution with contributorId: %s, did not update", contributor_id)
+        # create all new contributions in a single request
+        self.mutate_batch([("createContribution", contribution) for contribution in contributions])
+        logging.info("created %d contributions for workId: %s", len(contributions), work.workId)
 
     def update_scielo_contributor(self, contributor, contributor_id):
         # find existing contributor in Thoth
         contributor_record = self.thoth.contributor(contributor_id, True)
-        thoth_contributor = json.loads(contributor_record)['data']['contributor']
+        thoth_contributor = orjson.loads(contributor_record)['data']['contributor']
         # remove unnecesary fields for comparison to contributor
         del thoth_contributor['__typename']
         del thoth_contributor['contributions']
@@ -130,9 +131,10 @@ class SciELOLoader(BookLoader):
             # so only update if combined_contributor is different from thoth_contributor
             if combined_contributor != thoth_contributor:
                 self.thoth.update_contributor(combined_contributor)
-                logging.info(f"updated contributor: {contributor_id}")
+                logging.info("updated contributor: %s", contributor_id)
         else:
-            logging.info(f"contributor data from JSON and Thoth matches, no changes needed to Thoth for contributorID {contributor_id}")
+            logging.info("contributor data from JSON and Thoth matches, "
+                         "no changes needed to Thoth for contributorID %s", contributor_id)
         return contributor
 
     def create_languages(self, record, work):
@@ -161,7 +163,7 @@ class SciELOLoader(BookLoader):
             "mainLanguage": "true"
         }
         self.thoth.create_language(language)
-        logging.info(f"created language for workId: {work.workId}")
+        logging.info("created language for workId: %s", work.workId)
 
     def create_publications(self, record, work):
         """Creates PDF, EPUB, and paperback publications associated with the current work
@@ -174,8 +176,7 @@ class SciELOLoader(BookLoader):
 
         # logic for chapter metadata
         if record["TYPE"] == "Part":
-            books_url_regex = r"https://books\.scielo\.org/id/.{5}"
-            match = re.match(books_url_regex, pdf_url)
+            match = self.books_url_regex.match(pdf_url)
             if match:
                 books_url = match.group()
             else:
@@ -192,6 +193,10 @@ class SciELOLoader(BookLoader):
                 ["EPUB", eisbn, books_url, epub_url],
                 ["PAPERBACK", isbn, books_url, None]
             ]
+        publications_by_type = {p.publicationType: p for p in work.publications}
+        new_publications = []
+        new_locations = []
+        locations = []
         for publication_type, isbn, landing_page, full_text in publications:
             publication = {
                 "workId": work.workId,
@@ -206,26 +211,35 @@ class SciELOLoader(BookLoader):
                 "weightG": None,
                 "weightOz": None,
             }
-
-            existing_pub = next((p for p in work.publications if p.publicationType == publication_type), None)
-            if existing_pub:
-                publication_id = existing_pub.publicationId
-                logging.info(f"existing publication: {publication_id}, did not update")
-            else:
-                publication_id = self.thoth.create_publication(publication)
-                logging.info(f"created publication: {publication_id}")
-            if existing_pub and any(location.locationPlatform == "SCIELO_BOOKS" for location in existing_pub.locations):
-                logging.info("existing location, did not update")
-                continue
             location = {
-                "publicationId": publication_id,
+                "publicationId": None,
                 "landingPage": landing_page,
                 "fullTextUrl": full_text,
                 "locationPlatform": "SCIELO_BOOKS",
                 "canonical": "true",
             }
-            self.thoth.create_location(location)
-            logging.info(f"created location with publicationId {publication_id}")
+
+            existing_pub = publications_by_type.get(publication_type)
+            if existing_pub:
+                logging.info("existing publication: %s, did not update", existing_pub.publicationId)
+                if any(existing_location.locationPlatform == "SCIELO_BOOKS"
+                       for existing_location in existing_pub.locations):
+                    logging.info("existing location, did not update")
+                    continue
+                location["publicationId"] = existing_pub.publicationId
+            else:
+                new_publications.append(publication)
+                new_locations.append(location)
+            locations.append(location)
+
+        # create missing publications in one request, then all their locations in another
+        publication_ids = self.mutate_batch(
+            [("createPublication", publication) for publication in new_publications])
+        for location, publication_id in zip(new_locations, publication_ids):
+            location["publicationId"] = publication_id
+            logging.info("created publication: %s", publication_id)
+        self.mutate_batch([("createLocation", location) for location in locations])
+        logging.info("created %d locations for workId: %s", len(locations), work.workId)
 
 
 class SciELOChapterLoader(SciELOLoader):
@@ -233,63 +247,69 @@ class SciELOChapterLoader(SciELOLoader):
 
     def run(self):
         """Process JSON and call Thoth to insert its data"""
-        for record in self.data:
-            logging.info("*************\n" * 4)
-            logging.info(f"processing chapter: {record['title']}")
-
-            book_title = record["monograph_title"]
-            chapter_internal_id = record["_id"]
-            book_id = self.get_book_by_title(book_title).workId
-            relation_ordinal = record["order"]
-            chapter_exists = False
+        self.process_records(self.data, self.process_record)
+
+    def process_record(self, record):
+        """Create or update a single chapter and its associated data
+
+        record: current JSON record
+        """
+        logging.info("*************\n" * 4)
+        logging.info("processing chapter: %s", record['title'])
+
+        book_title = record["monograph_title"]
+        chapter_internal_id = record["_id"]
+        book_id = self.get_book_by_title(book_title).workId
+        relation_ordinal = record["order"]
+        chapter_exists = False
+        try:
+            chapter = self.get_chapter_by_string(chapter_internal_id)
+            chapter_exists = True
+            logging.info("Chapter already exists, attempting to update")
             try:
-                chapter = self.get_chapter_by_string(chapter_internal_id)
-                chapter_exists = True
-                logging.info("Chapter already exists, attempting to update")
-                try:
-                    work = self.get_work(record, self.imprint_id, book_id, chapter_exists)
-                    chapter.update((k, v) for k, v in work.items() if v is not None)
-                    # handle case where firstPage, lastPage, and chapterInterval were null in JSON, and thus
-                    # weren't added to record in Thoth, creating an error with update_work
-                    if 'firstPage' not in chapter:
-                        chapter['firstPage'] = None
-                    if 'lastPage' not in chapter:
-                        chapter['lastPage'] = None
-                    if 'pageInterval' not in chapter:
-                        chapter['pageInterval'] = None
-                    chapter_id = self.thoth.update_work(chapter)
-                    logging.info(f"updated chapter: {chapter['title']}")
-                    chapter_work = self.thoth.work_by_id(chapter_id)
-                    self.create_languages(record, chapter_work)
-                    logging.info("languages updated")
-                    self.create_contributors(record, chapter_work)
-                    logging.info("contributors updated")
-                    self.create_publications(record, chapter_work)
-                    logging.info("publications updated")
-                except ThothError as t:
-                    logging.error(f"Failed to update chapter: {chapter['title']}, exception: {t}")
-                    sys.exit(1)
-            except IndexError:
-                logging.info("Chapter does not exist in Thoth, creating")
-                chapter_exists = False
-                # add new chapter to Book Work
                 work = self.get_work(record, self.imprint_id, book_id, chapter_exists)
-                chapter_id = self.thoth.create_work(work)
-                logging.info(f"created chapter: {chapter_id}")
+                chapter.update((k, v) for k, v in work.items() if v is not None)
+                # handle case where firstPage, lastPage, and chapterInterval were null in JSON, and thus
+                # weren't added to record in Thoth, creating an error with update_work
+                if 'firstPage' not in chapter:
+                    chapter['firstPage'] = None
+                if 'lastPage' not in chapter:
+                    chapter['lastPage'] = None
+                if 'pageInterval' not in chapter:
+                    chapter['pageInterval'] = None
+                chapter_id = self.thoth.update_work(chapter)
+                logging.info("updated chapter: %s", chapter['title'])
                 chapter_work = self.thoth.work_by_id(chapter_id)
                 self.create_languages(record, chapter_work)
-                logging.info("languages created")
+                logging.info("languages updated")
                 self.create_contributors(record, chapter_work)
-                logging.info("contributors created")
+                logging.info("contributors updated")
                 self.create_publications(record, chapter_work)
-                logging.info("publications created")
-                # convert relation_ordinal from JSON to int
-                if relation_ordinal == "00":
-                    relation_ordinal = 1
-                else:
-                    relation_ordinal = int(relation_ordinal) + 1
-                self.create_chapter_relation(book_id, chapter_id, relation_ordinal)
-                logging.info("chapter relation created")
+                logging.info("publications updated")
+            except ThothError as t:
+                logging.error("Failed to update chapter: %s, exception: %s", chapter['title'], t)
+                sys.exit(1)
+        except IndexError:
+            logging.info("Chapter does not exist in Thoth, creating")
+            chapter_exists = False
+            # add new chapter to Book Work
+            work = self.get_work(record, self.imprint_id, book_id, chapter_exists)
+            chapter_id = self.thoth.create_work(work)
+            logging.info("created chapter: %s", chapter_id)
+            chapter_work = self.created_work(work, chapter_id)
+            self.create_languages(record, chapter_work)
+            logging.info("languages created")
+            self.create_contributors(record, chapter_work)
+            logging.info("contributors created")
+            self.create_publications(record, chapter_work)
+            logging.info("publications created")
+            # convert relation_ordinal from JSON to int
+            if relation_ordinal == "00":
+                relation_ordinal = 1
+            else:
+                relation_ordinal = int(relation_ordinal) + 1
+            self.create_chapter_relation(book_id, chapter_id, relation_ordinal)
+            logging.info("chapter relation created")
 
     def get_work(self, record, imprint_id, book_id, chapter_exists):
         """Returns a dictionary with all attributes of a chapter 'work'
@@ -305,7 +325,7 @@ class SciELOChapterLoader(SciELOLoader):
         doi = None
 
         existing_book = self.thoth.work_by_id(book_id, True)
-        thoth_book_record = json.loads(existing_book)['data']['work']
+        thoth_book_record = orjson.loads(existing_book)['data']['work']
         place = thoth_book_record['place']
         cc_license = thoth_book_record['license']
         landing_page = thoth_book_record['landingPage']
@@ -323,7 +343,7 @@ class SciELOChapterLoader(SciELOLoader):
         if record["pages"][1][1]:
             last_page = record["pages"][1][1]
         if first_page and last_page:
-            page_interval = "{}–{}".format(first_page, last_page)
+            page_interval = f"{first_page}–{last_page}"
             if first_page.isdigit() and last_page.isdigit():
                 page_count = int(last_page) - int(first_page) + 1
                 # case for JSON with typos where last_page - first_page equals a negative number
@@ -337,7 +357,7 @@ class SciELOChapterLoader(SciELOLoader):
                     last_page_int = roman.fromRoman(last_page.upper())
                     page_count = last_page_int - first_page_int + 1
                 except ValueError:
-                    logging.error(f"{first_page}–{last_page} are not integer or roman numeral; skipping adding")
+                    logging.error("%s–%s are not integer or roman numeral; skipping adding", first_page, last_page)
                     pass
 
         work = {
@@ -406,7 +426,7 @@ class SciELOChapterLoader(SciELOLoader):
         else:
             try:
                 self.thoth.work_by_doi(doi=doi)
-                logging.info(f"existing doi in Thoth: {doi} for different chapter, skip adding doi to current chapter")
+                logging.info("existing doi in Thoth: %s for different chapter, skip adding doi to current chapter", doi)
                 doi = None
             except ThothError:
                 doi = doi
@@ -415,39 +435,50 @@ class SciELOChapterLoader(SciELOLoader):
 
 class SciELOBookLoader(SciELOLoader):
     """SciELO specific logic to ingest metadata from Book JSON into Thoth"""
+    cache_works = True
+    highest_issue_ordinals = {}
 
     def run(self):
         """Process JSON and call Thoth to insert its data"""
-        for record in self.data:
-            logging.info("*************\n" * 4)
-            logging.info(f"processing book: {record['title']}")
-            work = self.get_work(record, self.imprint_id)
-            # try to find the work in Thoth
+        self.process_records(self.data, self.process_record)
+
+    def process_record(self, record):
+        """Create or update a single book and its associated data
+
+        record: current JSON record
+        """
+        logging.info("*************\n" * 4)
+        logging.info("processing book: %s", record['title'])
+        work = self.get_work(record, self.imprint_id)
+        # look the work up in the cache of existing works, prefetched by DOI
+        work_id = self.find_work_id(work['doi'])
+        if work_id:
+            existing_work = self.thoth.work_by_id(work_id)
+            # if work is found, try to update it with the new data
             try:
-                work_id = self.thoth.work_by_doi(work['doi']).workId
-                existing_work = self.thoth.work_by_id(work_id)
-                # if work is found, try to update it with the new data
-                if existing_work:
-                    try:
-                        existing_work.update((k, v) for k, v in work.items() if v is not None)
-                        self.thoth.update_work(existing_work)
-                        logging.info(f"updated workId: {work_id}")
-                    # if update fails, log the error and exit the import
-                    except ThothError as t:
-                        logging.error(f"Failed to update work with id {work_id}, exception: {t}")
-                        sys.exit(1)
-            # if work isn't found, create it
-            except (IndexError, AttributeError, ThothError):
-                work_id = self.thoth.create_work(work)
-                logging.info(f"created workId: {work_id}")
-            work = self.thoth.work_by_id(work_id)
-            # below methods check for existing data
-            # and create or update as necessary
-            self.create_publications(record, work)
-            self.create_contributors(record, work)
-            self.create_languages(record, work)
-            self.create_subjects(record, work)
-            self.create_series(record, self.imprint_id, work_id)
+                # skip the update when the JSON adds nothing new
+                if self.merge_work(existing_work, work):
+                    self.thoth.update_work(existing_work)
+                    logging.info("updated workId: %s", work_id)
+                work = existing_work
+            # if update fails, log the error and exit the import
+            except ThothError as t:
+                logging.error("Failed to update work with id %s, exception: %s", work_id, t)
+                sys.exit(1)
+        # if work isn't found, create it
+        else:
+            work_id = self.thoth.create_work(work)
+            logging.info("created workId: %s", work_id)
+            if work['doi']:
+                self.all_works[work['doi']] = work_id
+            work = self.created_work(work, work_id)
+        # below methods check for existing data
+        # and create or update as necessary
+        self.create_publications(record, work)
+        self.create_contributors(record, work)
+        self.create_languages(record, work)
+        self.create_subjects(record, work)
+        self.create_series(record, self.imprint_id, work_id)
 
     def get_work(self, record, imprint_id):
         """Returns a dictionary with all attributes of a book 'work'
@@ -459,13 +490,14 @@ class SciELOBookLoader(SciELOLoader):
         title = self.split_title(record["title"])
         doi = self.sanitise_doi(record["doi_number"])
         publication_date = self.sanitise_date(record["year"])
+        city, country = record["city"], record["country"]
         publication_place = None
-        if record["city"] and record["country"]:
-            publication_place = record["city"] + ", " + record["country"]
-        elif record["city"] and not record["country"]:
-            publication_place = record["city"]
-        elif not record["city"] and record["country"]:
-            publication_place = record["country"]
+        if city and country:
+            publication_place = city + ", " + country
+        elif city and not country:
+            publication_place = city
+        elif not city and country:
+            publication_place = country
         work_type = None
         # create workType based on creator role
         for creator in record["creators"]:
@@ -488,7 +520,7 @@ class SciELOBookLoader(SciELOLoader):
             "doi": doi,
             "publicationDate": publication_date,
             "place": publication_place,
-            "pageCount": int(record["pages"]),
+            "pageCount": self.sanitise_int(record["pages"]),
             "pageBreakdown": None,
             "imageCount": None,
             "tableCount": None,
@@ -519,32 +551,35 @@ class SciELOBookLoader(SciELOLoader):
 
         work: Work from Thoth
         """
-        bisac_subject_code = record["bisac_code"][0][0][1]
-        keyword_subject_codes = record["primary_descriptor"].split("; ")
+        try:
+            bisac_subject_code = record["bisac_code"][0][0][1]
+        except (IndexError, TypeError):
+            bisac_subject_code = None
+        keyword_subject_codes = record["primary_descriptor"].split("; ") if record["primary_descriptor"] else []
+
+        subjects = []
+        subject_keys = {(s.subjectType, s.subjectCode) for s in work.subjects}
 
         def create_subject(subject_type, subject_code, subject_ordinal):
-            subject = {
+            subject_keys.add((subject_type, subject_code))
+            subjects.append({
                 "workId": work.workId,
                 "subjectType": subject_type,
                 "subjectCode": subject_code,
                 "subjectOrdinal": subject_ordinal
-            }
-            self.thoth.create_subject(subject)
+            })
 
         # check if the work already has a subject with the BISAC subject code
-        if not any(s.subjectCode == bisac_subject_code and s.subjectType == "BISAC" for s in work.subjects):
-            logging.info("New BISAC subject")
+        if bisac_subject_code and ("BISAC", bisac_subject_code) not in subject_keys:
             create_subject("BISAC", bisac_subject_code, 1)
-        else:
-            logging.info("Existing BISAC subject")
 
         for subject_ordinal, keyword in enumerate(keyword_subject_codes, start=1):
             # check if the work already has a subject with the keyword subject type/subject code combination
-            if not any(s.subjectCode == keyword and s.subjectType == "KEYWORD" for s in work.subjects):
-                logging.info("New keyword subject")
+            if ("KEYWORD", keyword) not in subject_keys:
                 create_subject("KEYWORD", keyword, subject_ordinal)
-            else:
-                logging.info("Existing keyword subject")
+        # create all new subjects in a single request
+        self.mutate_batch([("createSubject", subject) for subject in subjects])
+        logging.info("created %d subjects for workId: %s", len(subjects), work.workId)
 
     def create_series(self, record, imprint_id, work_id):
         """Creates series associated with the current work
@@ -554,9 +589,10 @@ class SciELOBookLoader(SciELOLoader):
         work_id: previously obtained ID of the current work
         """
         series = None
-        series_name = record["serie"][0][1]
-        issue_ordinal = int(record["serie"][2][1]) if record["serie"][2][1] else None
-        issn_digital = record["serie"][3][1]
+        serie = record["serie"]
+        series_name = serie[0][1]
+        issue_ordinal = self.sanitise_int(serie[2][1])
+        issn_digital = serie[3][1]
         series_type = "BOOK_SERIES"
         collection_title = record["collection"][2][1]
         # series title can be stored in either "serie" or "collection" in JSON
@@ -573,22 +609,39 @@ class SciELOBookLoader(SciELOLoader):
                 "seriesCfpUrl": None
             }
         if series:
-            if series["seriesName"] not in self.all_series:
-                series_id = self.thoth.create_series(series)
-                logging.info(f"Series {series['seriesName']} created")
-                self.all_series[series["seriesName"]] = series_id
-            else:
-                series_id = self.all_series[series["seriesName"]]
-                logging.info(f"Series {series['seriesName']} already exists")
-            series = self.thoth.series(series_id)
-            highest_issue_ordinal = max((issue.issueOrdinal for issue in series.issues), default=0)
-            issue = {
-                "seriesId": series_id,
-                "workId": work_id,
-                "issueOrdinal": int(issue_ordinal) if issue_ordinal else highest_issue_ordinal + 1
-                }
-            if issue["workId"] not in self.all_issues:
-                issue_id = self.thoth.create_issue(issue)
-                logging.info(f"issue with issueId {issue_id} created in Thoth")
-            else:
-                logging.info(f"issue with work.workId {issue['workId']} already in Thoth, skipping")
+            # issue ordinals are numbered per series: books in the same series wait for each other
+            with self.key_lock(("series", series["seriesName"])):
+                with self.cache_lock:
+                    series_id = self.all_series.get(series["seriesName"])
+                if series_id is None:
+                    series_id = self.thoth.create_series(series)
+                    logging.info("Series %s created", series['seriesName'])
+                    with self.cache_lock:
+                        self.all_series[series["seriesName"]] = series_id
+                        self.highest_issue_ordinals[series_id] = 0
+                else:
+                    logging.info("Series %s already exists", series['seriesName'])
+                # fetch existing issues only the first time a series is seen in this run
+                with self.cache_lock:
+                    highest_issue_ordinal = self.highest_issue_ordinals.get(series_id)
+                if highest_issue_ordinal is None:
+                    series = self.thoth.series(series_id)
+                    highest_issue_ordinal = max((issue.issueOrdinal for issue in series.issues), default=0)
+                    with self.cache_lock:
+                        self.highest_issue_ordinals[series_id] = highest_issue_ordinal
+                issue = {
+                    "seriesId": series_id,
+                    "workId": work_id,
+                    "issueOrdinal": int(issue_ordinal) if issue_ordinal else highest_issue_ordinal + 1
+                    }
+                with self.cache_lock:
+                    issue_exists = issue["workId"] in self.all_issues
+                if not issue_exists:
+                    issue_id = self.thoth.create_issue(issue)
+                    logging.info("issue with issueId %s created in Thoth", issue_id)
+                    with self.cache_lock:
+                        self.all_issues[work_id] = issue_id
+                        self.highest_issue_ordinals[series_id] = max(highest_issue_ordinal,
+                                                                     issue["issueOrdinal"])
+                else:
+                    logging.info("issue with work.workId %s already in Thoth, skipping", issue['workId'])
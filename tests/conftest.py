@@ -0,0 +1,57 @@
+"""Shared fixtures for the loader tests"""
+import os
+import sys
+import threading
+
+import pytest
+
+# the loaders are modules at the top of the repository, not an installed package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeResponse:
+    """Final response after following a DOI's redirects, usable as a context manager like requests'"""
+
+    def __init__(self, url, status_code):
+        self.url = url
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.closed = True
+
+
+class FakeSession:
+    """Stands in for the pooled DOI session, recording each DOI requested
+
+    responses: dictionary of DOI to (landing page, HTTP status) of the final response
+    """
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        # the body must be streamed, so that it isn't downloaded
+        assert kwargs.get("stream")
+        self.requested.append(url)
+        return FakeResponse(*self.responses[url])
+
+
+@pytest.fixture
+def make_loader():
+    """Return a function creating a loader without running __init__, which parses a metadata file
+    and logs into Thoth, with empty caches and a fake DOI session answering the given responses"""
+    def make(loader_class, responses=None):
+        loader = loader_class.__new__(loader_class)
+        loader.cache_lock = threading.RLock()
+        loader.key_locks = {}
+        loader.all_landing_pages = {}
+        loader.landing_page_times = {}
+        loader.doi_session = FakeSession(responses or {})
+        return loader
+    return make
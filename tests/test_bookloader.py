@@ -0,0 +1,294 @@
+"""Tests for the shared BookLoader helpers"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+from thothlibrary import ThothError
+from thothlibrary.errors import ResponseEmptyError
+
+from bookloader import BatchMutationError, BookLoader, NormalisedKeyDict
+
+FOUND = "https://doi.org/10.1/found"
+MISSING = "https://doi.org/10.1/missing"
+
+
+@pytest.fixture
+def loader(make_loader):
+    return make_loader(BookLoader, {
+        FOUND: ("https://press.example.org/books/found", 200),
+        MISSING: ("https://press.example.org/404", 404),
+    })
+
+
+def test_successful_resolution_is_cached(loader):
+    for _ in range(2):
+        assert loader.resolve_doi(FOUND) == "https://press.example.org/books/found"
+    assert loader.doi_session.requested == [FOUND]
+    assert FOUND in loader.landing_page_times
+
+
+def test_failed_resolution_is_not_cached(loader):
+    for _ in range(2):
+        assert loader.resolve_doi(MISSING) == "https://press.example.org/404"
+    assert loader.doi_session.requested == [MISSING, MISSING]
+    assert MISSING not in loader.all_landing_pages
+
+
+class SlowThoth:
+    """Thoth client whose create_contributor takes a while, counting the contributors created"""
+
+    def __init__(self):
+        self.created = []
+
+    def create_contributor(self, contributor):
+        time.sleep(0.05)
+        self.created.append(contributor["fullName"])
+        return "id-%d" % len(self.created)
+
+
+def test_resolve_contributor_creates_each_contributor_once(make_loader):
+    loader = make_loader(BookLoader)
+    loader.all_contributors = NormalisedKeyDict()
+    loader.all_contributor_orcids = {}
+    loader.thoth = SlowThoth()
+    names = ["Jane Doe", "jane  doe", "John Roe", "Jane Doe"]
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        ids = list(executor.map(
+            lambda name: loader.resolve_contributor(name, None, lambda: {"fullName": name}), names))
+    assert len(loader.thoth.created) == 2
+    assert ids[0] == ids[1] == ids[3] != ids[2]
+
+
+def test_key_lock_only_blocks_matching_keys(make_loader):
+    loader = make_loader(BookLoader)
+    acquired = []
+
+    def lock(key):
+        with loader.key_lock(("doi", key)):
+            acquired.append(key)
+
+    threads = [threading.Thread(target=lock, args=(key,)) for key in ("a", "b")]
+    with loader.key_lock(("doi", "a")):
+        for thread in threads:
+            thread.start()
+        threads[1].join(timeout=1)
+        assert acquired == ["b"]
+    threads[0].join(timeout=1)
+    assert acquired == ["b", "a"]
+
+
+class FakeClient:
+    """GraphQL client answering the query for the latest updatedAt"""
+
+    def __init__(self, newest_update):
+        self.newest_update = newest_update
+
+    def execute(self, request):
+        if self.newest_update is None:
+            return '{"data": null, "errors": [{"message": "Unknown field"}]}'
+        return '{"data": {"contributors": [{"updatedAt": "%s"}]}}' % self.newest_update
+
+
+@pytest.fixture
+def cached_loader(make_loader, tmp_path, monkeypatch):
+    monkeypatch.setattr(BookLoader, "persist_cache", True)
+    loader = make_loader(BookLoader)
+    loader.cache_file = str(tmp_path / "thoth-loader" / "cache.json")
+    loader.thoth = SimpleNamespace(graphql_endpoint="https://api.example.org/graphql",
+                                   QUERIES={"contributors": {"fields": ["contributorId", "fullName"]}},
+                                   client=FakeClient("2024-01-01T00:00:00+00:00"))
+    return loader
+
+
+def load_contributors(loader, names):
+    """Load a cache of contributor names, returning it and the number of pages fetched from Thoth"""
+    cache = {}
+    pages = []
+
+    def add_page(limit, offset):
+        pages.append(offset)
+        cache.update(names)
+        return loader.thoth.client.newest_update
+    loader.load_cache("contributors", (cache,), len(names), add_page)
+    return cache, len(pages)
+
+
+def test_load_cache_reuses_unchanged_records(cached_loader):
+    assert load_contributors(cached_loader, {"Jane Doe": "id-1"}) == ({"Jane Doe": "id-1"}, 1)
+    assert "updatedAt" in cached_loader.thoth.QUERIES["contributors"]["fields"]
+    assert load_contributors(cached_loader, {"Jane Doe": "id-1"}) == ({"Jane Doe": "id-1"}, 0)
+
+
+def test_load_cache_rebuilds_when_records_were_updated(cached_loader):
+    load_contributors(cached_loader, {"Jane Doe": "id-1"})
+    # a rename leaves the count unchanged
+    cached_loader.thoth.client.newest_update = "2024-02-01T00:00:00+00:00"
+    assert load_contributors(cached_loader, {"Jane Roe": "id-1"}) == ({"Jane Roe": "id-1"}, 1)
+
+
+def test_load_cache_rebuilds_when_freshness_is_unknown(cached_loader):
+    load_contributors(cached_loader, {"Jane Doe": "id-1"})
+    cached_loader.thoth.client.newest_update = None
+    assert load_contributors(cached_loader, {"Jane Doe": "id-1"}) == ({"Jane Doe": "id-1"}, 1)
+
+
+class FakeWorks:
+    """Thoth client holding one publisher's works, counting lookups by DOI"""
+
+    def __init__(self, works):
+        self.works_by_doi = works
+        self.lookups = []
+
+    def work_count(self, publishers):
+        return len(self.works_by_doi)
+
+    def works(self, limit, offset, publishers):
+        return [SimpleNamespace(doi=doi, workId=work_id)
+                for doi, work_id in list(self.works_by_doi.items())[offset:offset + limit]]
+
+    def work_by_doi(self, doi):
+        self.lookups.append(doi)
+        return SimpleNamespace(workId=self.works_by_doi[doi])
+
+
+@pytest.fixture
+def works_loader(make_loader):
+    loader = make_loader(BookLoader)
+    loader.all_works = {}
+    loader.publisher_id = "publisher-id"
+    loader.thoth = FakeWorks({"https://doi.org/10.1/old": "work-1"})
+    return loader
+
+
+def test_find_work_id_queries_thoth_without_prefetch(works_loader):
+    assert works_loader.find_work_id("https://doi.org/10.1/old") == "work-1"
+    assert works_loader.find_work_id("https://doi.org/10.1/old") == "work-1"
+    assert works_loader.thoth.lookups == ["https://doi.org/10.1/old"]
+
+
+def test_find_work_id_skips_thoth_after_prefetch(works_loader):
+    works_loader.cache_publisher_works()
+    assert works_loader.find_work_id("https://doi.org/10.1/old") == "work-1"
+    assert works_loader.find_work_id("https://doi.org/10.1/new") is None
+    assert works_loader.thoth.lookups == []
+
+
+class ScriptedClient:
+    """GraphQL client returning the given responses in turn, recording each request"""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def execute(self, request):
+        self.requests.append(request)
+        return self.responses.pop(0)
+
+
+def subject(code, ordinal):
+    return ("createSubject", {"workId": "work-1", "subjectType": "KEYWORD",
+                              "subjectCode": code, "subjectOrdinal": ordinal})
+
+
+@pytest.fixture
+def batch_loader(make_loader):
+    loader = make_loader(BookLoader)
+    loader.thoth = SimpleNamespace(client=None)
+    return loader
+
+
+def test_mutate_batch_retries_empty_responses(batch_loader):
+    batch_loader.thoth.client = ScriptedClient("", '{"data": {"m0": {"subjectId": "s-1"}}}')
+    assert batch_loader.mutate_batch([subject("history", 1)]) == ["s-1"]
+    assert len(batch_loader.thoth.client.requests) == 2
+
+
+def test_mutate_batch_gives_up_after_repeated_empty_responses(batch_loader):
+    batch_loader.thoth.client = ScriptedClient("", "", "")
+    with pytest.raises(ResponseEmptyError):
+        batch_loader.mutate_batch([subject("history", 1)])
+
+
+def test_mutate_batch_reports_partial_results(batch_loader):
+    batch_loader.thoth.client = ScriptedClient(
+        '{"data": {"m0": {"subjectId": "s-1"}, "m1": null},'
+        ' "errors": [{"message": "duplicate ordinal", "path": ["m1"]}]}')
+    with pytest.raises(BatchMutationError) as error:
+        batch_loader.mutate_batch([subject("history", 1), subject("art", 1)])
+    assert error.value.results == ["s-1", None]
+
+
+def test_mutate_batch_reports_unknown_results_without_data(batch_loader):
+    batch_loader.thoth.client = ScriptedClient('{"data": null, "errors": [{"message": "invalid"}]}')
+    with pytest.raises(BatchMutationError) as error:
+        batch_loader.mutate_batch([subject("history", 1), subject("art", 2)])
+    assert error.value.results == [None, None]
+
+
+def test_mutate_batch_rejects_malformed_responses(batch_loader):
+    batch_loader.thoth.client = ScriptedClient("<html>Bad Gateway</html>")
+    with pytest.raises(ThothError):
+        batch_loader.mutate_batch([subject("history", 1)])
+
+
+def test_mutate_batch_aliases_mutations_in_order(batch_loader):
+    batch_loader.thoth.client = ScriptedClient(
+        '{"data": {"m1": {"subjectId": "s-2"}, "m0": {"subjectId": "s-1"}}}')
+    assert batch_loader.mutate_batch([subject("history", 1), subject("art", 2)]) == ["s-1", "s-2"]
+    request = batch_loader.thoth.client.requests[0]
+    assert request.index('m0: createSubject(') < request.index('m1: createSubject(')
+    assert request.index('"history"') < request.index('m1:') < request.index('"art"')
+
+
+def test_mutate_batch_escapes_values(batch_loader):
+    batch_loader.thoth.client = ScriptedClient('{"data": {"m0": {"subjectId": "s-1"}}}')
+    batch_loader.mutate_batch([subject('the "new"\nhistory', 1)])
+    assert 'subjectCode: "the \\"new\\"\\nhistory"' in batch_loader.thoth.client.requests[0]
+
+
+def test_mutate_batch_skips_empty_batches(batch_loader):
+    batch_loader.thoth.client = ScriptedClient()
+    assert batch_loader.mutate_batch([]) == []
+    assert batch_loader.thoth.client.requests == []
+
+
+def test_normalised_key_dict_prefers_exact_keys():
+    names = NormalisedKeyDict()
+    names["de la Cruz"] = "id-1"
+    names["De La Cruz"] = "id-2"
+    assert names["de la Cruz"] == "id-1"
+    assert names["De La Cruz"] == "id-2"
+    assert len(names) == 2
+
+
+def test_normalised_key_dict_falls_back_to_normalised_keys():
+    names = NormalisedKeyDict({"Jane  Doe": "id-1", "JANE DOE": "id-2"})
+    # the first key stored answers lookups that match neither exactly
+    assert names.get("jane doe") == "id-1"
+    assert " Jane Doe " in names
+    assert names.get("John Doe") is None
+    with pytest.raises(KeyError):
+        names["John Doe"]
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_process_records_processes_every_record(make_loader, max_workers):
+    loader = make_loader(BookLoader)
+    loader.max_workers = max_workers
+    processed = []
+    loader.process_records(range(20), processed.append)
+    assert sorted(processed) == list(range(20))
+
+
+def test_process_records_raises_errors_from_worker_threads(make_loader):
+    loader = make_loader(BookLoader)
+    loader.max_workers = 4
+
+    def process_record(record):
+        if record == 7:
+            raise ValueError("bad record")
+
+    with pytest.raises(ValueError, match="bad record"):
+        loader.process_records(range(20), process_record)
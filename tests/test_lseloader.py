@@ -0,0 +1,72 @@
+"""Tests for the LSE Press ONIX 3.0 loader"""
+import pytest
+
+from lseloader import LSELoader
+
+DOI = "https://doi.org/10.31389/lsepress.abc"
+LANDING_PAGE = "https://press.lse.ac.uk/site/books/e/10.31389/lsepress.abc/"
+
+
+class FakeRecord:
+    """Minimal Onix3Record exposing the fields get_work reads"""
+
+    @staticmethod
+    def title():
+        return {"fullTitle": "Sample Book: A Subtitle", "title": "Sample Book", "subtitle": "A Subtitle"}
+
+    @staticmethod
+    def doi():
+        return DOI
+
+    @staticmethod
+    def work_type():
+        return "MONOGRAPH"
+
+    @staticmethod
+    def reference():
+        return "LSE-001"
+
+    @staticmethod
+    def publication_date():
+        return "2021-05-04"
+
+    @staticmethod
+    def publication_place():
+        return "London"
+
+    @staticmethod
+    def page_count():
+        return 212
+
+    @staticmethod
+    def license():
+        return "https://creativecommons.org/licenses/by/4.0/"
+
+    @staticmethod
+    def long_abstract():
+        return "First line.\r\nSecond line."
+
+    @staticmethod
+    def cover_url():
+        return "https://press.lse.ac.uk/cover.jpg"
+
+
+@pytest.fixture
+def loader(make_loader):
+    return make_loader(LSELoader, {DOI: (LANDING_PAGE, 200)})
+
+
+def test_get_work(loader):
+    work = loader.get_work(FakeRecord(), "imprint-id")
+    assert work["workType"] == "MONOGRAPH"
+    assert work["fullTitle"] == "Sample Book: A Subtitle"
+    assert work["imprintId"] == "imprint-id"
+    assert work["doi"] == DOI
+    assert work["landingPage"] == LANDING_PAGE
+    assert work["longAbstract"] == "First line.\nSecond line."
+
+
+def test_get_work_resolves_doi_once(loader):
+    loader.get_work(FakeRecord(), "imprint-id")
+    loader.get_work(FakeRecord(), "imprint-id")
+    assert loader.doi_session.requested == [DOI]
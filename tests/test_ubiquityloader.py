@@ -0,0 +1,15 @@
+"""Tests for the Ubiquity Press CSV loader"""
+from ubiquityloader import UbiquityPressesLoader
+
+
+def test_split_fields_keeps_quoted_commas():
+    assert UbiquityPressesLoader.split_fields('Doe, "University of London, Senate House", GB') == \
+        ["Doe", "University of London, Senate House", "GB"]
+
+
+def test_split_fields_strips_whitespace():
+    assert UbiquityPressesLoader.split_fields(' 9781911529, PDF ,  "" ') == ["9781911529", "PDF", ""]
+
+
+def test_split_fields_keeps_empty_fields():
+    assert UbiquityPressesLoader.split_fields("a,,c") == ["a", "", "c"]
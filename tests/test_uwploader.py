@@ -0,0 +1,37 @@
+"""Tests for the University of Westminster Press MARC XML loader"""
+import pymarc
+import pytest
+
+from uwploader import UWPLoader
+
+
+def marc_record(*prices):
+    """Return a MARC record whose 037$c subfields hold the given price strings"""
+    record = pymarc.Record()
+    record.add_field(pymarc.Field(tag="037", indicators=[" ", " "],
+                                  subfields=[pymarc.Subfield("c", price) for price in prices]))
+    return record
+
+
+@pytest.fixture
+def loader(make_loader):
+    return make_loader(UWPLoader)
+
+
+def test_get_prices_reads_labelled_prices(loader):
+    record = marc_record("£24.99 (hardback)", "£ 14.99 (Paperback)")
+    assert loader.get_prices(record) == {"HARDBACK": "24.99", "PAPERBACK": "14.99"}
+
+
+def test_get_prices_assigns_unlabelled_prices_paperback_first(loader):
+    assert loader.get_prices(marc_record("£14.99", "£24.99")) == {"PAPERBACK": "14.99", "HARDBACK": "24.99"}
+
+
+def test_get_prices_prefers_labelled_prices(loader):
+    # the unlabelled price would be the paperback's, which is already labelled
+    record = marc_record("£9.99", "£14.99 (paperback)")
+    assert loader.get_prices(record) == {"PAPERBACK": "14.99"}
+
+
+def test_get_prices_ignores_zero_and_unparseable_prices(loader):
+    assert loader.get_prices(marc_record("£0.00 (pdf)", "Free", "£0 (paperback)")) == {}
@@ -0,0 +1,43 @@
+"""Pooled HTTP transport for Thoth's GraphQL API"""
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from thothlibrary.graphql import GraphQLClientRequests
+
+
+class SessionGraphQLClient(GraphQLClientRequests):
+    """GraphQL client sending every request through a single keep-alive session
+
+    thothlibrary's default client calls requests.post for each query, opening
+    a new connection (and TLS handshake) every time.
+    """
+    pool_size = 32
+    # Mutations are not idempotent, so only retry failures where the request
+    # cannot have been processed: connection errors and 503 Service Unavailable.
+    # Read timeouts and other 5xx responses may follow a committed write.
+    retries = Retry(total=5, connect=5, read=0, other=0, status=5,
+                    status_forcelist=(503,), allowed_methods=frozenset({"POST"}),
+                    backoff_factor=0.5, raise_on_status=False)
+
+    def __init__(self, endpoint):
+        super().__init__(endpoint)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size,
+                              pool_maxsize=self.pool_size,
+                              max_retries=self.retries)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json",
+                                     "Content-Type": "application/json"})
+
+    def _send(self, query, variables):
+        data = {"query": query,
+                "variables": variables}
+        headers = {}
+        if self.token is not None:
+            headers[self.headername] = f"{self.token}"
+        response = self.session.post(self.endpoint,
+                                     data=orjson.dumps(data),
+                                     headers=headers)
+        return response.content.decode("utf-8")
@@ -1,6 +1,7 @@
 """Load Ubiquity presses metadata into Thoth"""
+import csv
+import logging
 import re
-import pandas as pd
 
 from bookloader import BookLoader
 from thothlibrary import ThothError
@@ -12,119 +13,174 @@ class UbiquityPressesLoader(BookLoader):
     Currently only ingests works from LSE Press and University of Westminster Press
     Works which already exist in Thoth should be extended/overwritten
     """
+    # publishers whose works are ingested, with the details used if they need creating in Thoth
+    publishers = {
+        "LSE Press": {
+            "shortname": None,
+            "url": "https://press.lse.ac.uk/",
+        },
+        "University of Westminster Press": {
+            "shortname": "UWP",
+            "url": "https://www.uwestminsterpress.co.uk/",
+        },
+    }
+    # fields of a child work (chapter) that aren't inherited from its parent are left empty
+    child_work_template = {
+        "workType": "BOOK_CHAPTER",
+        "workStatus": None,
+        "fullTitle": None,
+        "title": None,
+        "subtitle": None,
+        "reference": None,
+        "edition": None,
+        "imprintId": None,
+        "doi": None,
+        "publicationDate": None,
+        "place": None,
+        "pageCount": None,
+        "pageBreakdown": None,
+        "firstPage": None,
+        "lastPage": None,
+        "pageInterval": None,
+        "imageCount": None,
+        "tableCount": None,
+        "audioCount": None,
+        "videoCount": None,
+        "license": None,
+        "copyrightHolder": None,
+        "landingPage": None,
+        "lccn": None,
+        "oclc": None,
+        "shortAbstract": None,
+        "longAbstract": None,
+        "generalNote": None,
+        "toc": None,
+        "coverUrl": None,
+        "coverCaption": None,
+    }
+    # patterns for the nested tuples packed into the CSV's multi-valued columns
+    contributions_regex = re.compile(r'\((.*?\[.*?\])\)')
+    publications_regex = re.compile(r'\((.*?\[.*?\], ?\[.*?\])\)')
+    prices_locations_regex = re.compile(r'\[(.*?)\], ?\[(.*?)\]')
+    tuple_regex = re.compile(r'\((.*?)\)')
+    quoted_tuple_regex = re.compile(r'\((".*?")\)')
+    quoted_regex = re.compile(r'"(.*?)"')
+    licenses = {
+        "cc-4-by": "https://creativecommons.org/licenses/by/4.0/",
+        "cc-4-by-nc": "https://creativecommons.org/licenses/by-nc/4.0/",
+        "cc-4-by-nc-nd": "https://creativecommons.org/licenses/by-nc-nd/4.0/",
+    }
+    # CSV column holding each type of subject codes
+    subject_columns = {
+        "bic": "BIC",
+        "thema": "THEMA",
+        "bisac": "BISAC",
+        "lcc": "LCC",
+        "custom_categories": "CUSTOM",
+        "keywords": "KEYWORD",
+    }
+
+    @staticmethod
+    def split_fields(string):
+        """Split a comma-separated tuple from the CSV into its fields, keeping quoted commas"""
+        return [field.strip() for field in next(csv.reader([string], skipinitialspace=True))]
 
     def run(self):
         """Process CSV and call Thoth to insert its data"""
-        for row in self.data.index:
-            self.publisher_name = self.data.at[row, 'publisher']
-            if self.publisher_name == "LSE Press":
-                self.publisher_url = "https://press.lse.ac.uk/"
-                self.set_publisher_and_imprint()
-            elif self.publisher_name == "University of Westminster Press":
-                self.publisher_shortname = "UWP"
-                self.publisher_url = "https://www.uwestminsterpress.co.uk/"
-                self.set_publisher_and_imprint()
-            else:
+        # rows for the same publisher share an imprint: set it up once per publisher,
+        # then process that publisher's rows (concurrently, if max_workers allows)
+        for publisher_name, rows in self.data.groupby("publisher", sort=False):
+            publisher = self.publishers.get(publisher_name)
+            if publisher is None:
                 continue
-            work = self.get_work(row)
-            try:
-                work_id = self.thoth.work_by_doi(work['doi']).workId
+            self.publisher_name = publisher_name
+            self.publisher_shortname = publisher["shortname"]
+            self.publisher_url = publisher["url"]
+            self.set_publisher_and_imprint()
+            # look the publisher's works up by DOI in one paginated read rather than row by row
+            self.cache_publisher_works()
+            self.process_records(rows.itertuples(index=False), self.process_row)
+
+    def process_row(self, row):
+        """Create or update a single work and its associated data
+
+        row: current CSV row
+        """
+        work = self.get_work(row)
+        # another row may be creating this work as one of its children (see create_relations)
+        with self.key_lock(("doi", work['doi']) if work['doi'] else None):
+            work_id = self.find_work_id(work['doi'])
+            if work_id:
                 existing_work = self.thoth.work_by_id(work_id)
-                existing_work.update((k, v)
-                                     for k, v in work.items() if v is not None)
-                self.thoth.update_work(existing_work)
-            except (IndexError, AttributeError, ThothError):
+                # skip the update when the CSV adds nothing new
+                if self.merge_work(existing_work, work):
+                    self.thoth.update_work(existing_work)
+                # the updated work already holds everything needed below
+                work = existing_work
+            else:
                 work_id = self.thoth.create_work(work)
-            print("workId: {}".format(work_id))
-            work = self.thoth.work_by_id(work_id)
-            self.create_contributors(row, work)
-            self.create_publications(row, work)
-            self.create_languages(row, work)
-            self.create_subjects(row, work)
-            self.create_relations(row, work)
+                if work['doi']:
+                    with self.cache_lock:
+                        self.all_works[work['doi']] = work_id
+                work = self.created_work(work, work_id)
+        logging.info("workId: %s", work_id)
+        self.create_contributors(row, work)
+        self.create_publications(row, work)
+        self.create_languages(row, work)
+        self.create_subjects(row, work)
+        self.create_relations(row, work)
 
     # pylint: disable=too-many-locals
     def get_work(self, row):
         """Returns a dictionary with all attributes of a 'work'
 
-        row: current row number
+        row: current CSV row
         """
-        work_type = self.work_types[self.data.at[row, "work_type"]]
-        work_status = self.data.at[row, "work_status"] \
-            if pd.notna(self.data.at[row, "work_status"]) else "Active"
-        title = self.data.at[row, 'title']
-        subtitle = self.data.at[row, 'subtitle']
+        work_type = self.work_types[row.work_type]
+        work_status = row.work_status or "Active"
+        title = row.title
+        subtitle = row.subtitle
         title = self.sanitise_title(title, subtitle)
-        edition = int(self.data.at[row, "edition"]) \
-            if pd.notna(self.data.at[row, "edition"]) else None
-        doi = self.sanitise_doi(self.sanitise_string(self.data.at[row, 'doi'])) \
-            if self.data.at[row, 'doi'] else None
-        reference = str(self.data.at[row, "reference"]) \
-            if pd.notna(self.data.at[row, "reference"]) else None
-        publication_date = str(self.data.at[row, "publication_date"]) \
-            if pd.notna(self.data.at[row, "publication_date"]) else None
-        publication_place = str(self.data.at[row, "publication_place"]) \
-            if pd.notna(self.data.at[row, "publication_place"]) else None
-        license_abbrev = \
-            self.data.at[row, "license"] \
-            if pd.notna(self.data.at[row, "license"]) \
-            else None
-        if license_abbrev == None:
-            license_url = None
-        elif license_abbrev == "cc-4-by":
-            license_url = "https://creativecommons.org/licenses/by/4.0/"
-        elif license_abbrev == "cc-4-by-nc":
-            license_url = "https://creativecommons.org/licenses/by-nc/4.0/"
-        elif license_abbrev == "cc-4-by-nc-nd":
-            license_url = "https://creativecommons.org/licenses/by-nc-nd/4.0/"
-        else:
-            # TODO proper logging
-            print("Unrecognised license: %s" % license_abbrev)
-            raise
-        copyright_holder = self.data.at[row, 'copyright_holder'] \
-            if pd.notna(self.data.at[row, "copyright_holder"]) else None
-        landing_page = self.sanitise_url(self.data.at[row, "landing_page"]) \
-            if pd.notna(self.data.at[row, "landing_page"]) else None
-        page_count = int(self.data.at[row, "page_count"]) \
-            if pd.notna(self.data.at[row, "page_count"]) else None
-        page_breakdown = self.data.at[row, "page_breakdown"] \
-            if pd.notna(self.data.at[row, "page_breakdown"]) else None
-        first_page = str(self.data.at[row, "first_page"]) \
-            if pd.notna(self.data.at[row, "first_page"]) else None
-        last_page = str(self.data.at[row, "last_page"]) \
-            if pd.notna(self.data.at[row, "last_page"]) else None
-        page_interval = str(self.data.at[row, "page_interval"]) \
-            if pd.notna(self.data.at[row, "page_interval"]) else None
+        edition = self.sanitise_int(row.edition)
+        doi = self.sanitise_doi(self.sanitise_string(row.doi)) \
+            if row.doi else None
+        reference = str(row.reference) \
+            if row.reference is not None else None
+        publication_date = str(row.publication_date) \
+            if row.publication_date is not None else None
+        publication_place = str(row.publication_place) \
+            if row.publication_place is not None else None
+        license_abbrev = row.license
+        license_url = self.licenses.get(license_abbrev)
+        if license_abbrev is not None and license_url is None:
+            raise ValueError(f"Unrecognised license: {license_abbrev}")
+        copyright_holder = row.copyright_holder
+        landing_page = self.sanitise_url(row.landing_page)
+        page_count = self.sanitise_int(row.page_count)
+        page_breakdown = row.page_breakdown
+        first_page = str(row.first_page) \
+            if row.first_page is not None else None
+        last_page = str(row.last_page) \
+            if row.last_page is not None else None
+        page_interval = str(row.page_interval) \
+            if row.page_interval is not None else None
         if not page_interval and first_page and last_page:
-            page_interval = "{}–{}".format(first_page, last_page)
-        image_count = int(self.data.at[row, "image_count"]) \
-            if pd.notna(self.data.at[row, "image_count"]) else None
-        table_count = int(self.data.at[row, "table_count"]) \
-            if pd.notna(self.data.at[row, "table_count"]) else None
-        audio_count = int(self.data.at[row, "audio_count"]) \
-            if pd.notna(self.data.at[row, "audio_count"]) else None
-        video_count = int(self.data.at[row, "video_count"]) \
-            if pd.notna(self.data.at[row, "video_count"]) else None
-        lccn = str(self.data.at[row, "lccn"]) \
-            if pd.notna(self.data.at[row, "lccn"]) else None
-        oclc = str(self.data.at[row, "oclc"]) \
-            if pd.notna(self.data.at[row, "oclc"]) else None
-        short_abstract = \
-            self.data.at[row, "short_abstract"] \
-            if pd.notna(self.data.at[row, "short_abstract"]) \
-            else None
-        long_abstract = self.data.at[row, "long_abstract"] \
-            if pd.notna(self.data.at[row, "long_abstract"]) else None
-        general_note = self.data.at[row, "general_note"] \
-            if pd.notna(self.data.at[row, "general_note"]) else None
-        bibliography_note = self.data.at[row, "bibliography_note"] \
-            if pd.notna(self.data.at[row, "bibliography_note"]) else None
-        toc = self.data.at[row, "toc"] \
-            if pd.notna(self.data.at[row, "toc"]) else None
-        cover_url = self.data.at[row, "cover_url"] \
-            if pd.notna(self.data.at[row, "cover_url"]) else None
-        cover_caption = self.data.at[row, "cover_caption"] \
-            if pd.notna(self.data.at[row, "cover_caption"]) else None
+            page_interval = f"{first_page}–{last_page}"
+        image_count = self.sanitise_int(row.image_count)
+        table_count = self.sanitise_int(row.table_count)
+        audio_count = self.sanitise_int(row.audio_count)
+        video_count = self.sanitise_int(row.video_count)
+        lccn = str(row.lccn) \
+            if row.lccn is not None else None
+        oclc = str(row.oclc) \
+            if row.oclc is not None else None
+        short_abstract = row.short_abstract
+        long_abstract = row.long_abstract
+        general_note = row.general_note
+        bibliography_note = row.bibliography_note
+        toc = row.toc
+        cover_url = row.cover_url
+        cover_caption = row.cover_caption
 
         work = {
             "imprintId": self.imprint_id,
@@ -165,54 +221,44 @@ class UbiquityPressesLoader(BookLoader):
     def create_contributors(self, row, work):
         """Creates all contributions associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         work: current work
         """
-        column = self.data.at[row, "contributions"] \
-            if pd.notna(self.data.at[row, "contributions"]) else None
+        column = row.contributions
         if not column or not column.strip():
             return
-        contributions = re.findall('\\((.*?\\[.*?\\])\\)', column)
+        contributions = self.contributions_regex.findall(column)
         highest_contribution_ordinal = max(
             (c.contributionOrdinal for c in work.contributions), default=0)
+        contributions_by_contributor = {
+            c.contributor.contributorId: c for c in work.contributions}
+        # (existing contribution, new contribution, affiliation strings) for each contribution
+        resolved_contributions = []
         for contribution_string in contributions:
-            affiliations = re.findall('\\((".*?")\\)', contribution_string)
-            contribution = re.split(',', contribution_string)
-            contribution_type = contribution[0].strip().strip('"').upper()
-            contribution_type = self.contribution_types[contribution_type]
-            first_name = contribution[1].strip().strip('"')
-            last_name = contribution[2].strip().strip('"')
-            full_name = contribution[3].strip().strip('"')
-            is_main = contribution[4].strip().strip('"')
-            biography = contribution[5].strip().strip('"')
-            orcid = self.sanitise_orcid(contribution[6].strip().strip('"'))
-            website = contribution[7].strip().strip('"')
-
-            if orcid and orcid in self.all_contributors:
-                contributor_id = self.all_contributors[orcid]
-            elif full_name in self.all_contributors:
-                contributor_id = self.all_contributors[full_name]
-            else:
-                contributor = {
-                    "firstName": first_name,
-                    "lastName": last_name,
-                    "fullName": full_name,
-                    "orcid": orcid,
-                    "website": website,
-                }
-                contributor_id = self.thoth.create_contributor(contributor)
-                # cache new contributor
-                self.all_contributors[full_name] = contributor_id
-                if orcid:
-                    self.all_contributors[orcid] = contributor_id
-
-            existing_contribution = next(
-                (c for c in work.contributions if c.contributor.contributorId == contributor_id), None)
-            if existing_contribution:
-                contribution_id = existing_contribution.contributionId
-            else:
-                contribution = {
+            affiliations = self.quoted_tuple_regex.findall(contribution_string)
+            contribution = self.split_fields(contribution_string)
+            contribution_type = self.contribution_types[contribution[0].upper()]
+            first_name = contribution[1]
+            last_name = contribution[2]
+            full_name = contribution[3]
+            is_main = contribution[4]
+            biography = contribution[5]
+            orcid = self.sanitise_orcid(contribution[6])
+            website = contribution[7]
+
+            contributor_id = self.resolve_contributor(full_name, orcid, lambda: {
+                "firstName": first_name,
+                "lastName": last_name,
+                "fullName": full_name,
+                "orcid": orcid,
+                "website": website,
+            })
+
+            existing_contribution = contributions_by_contributor.get(contributor_id)
+            new_contribution = None
+            if not existing_contribution:
+                new_contribution = {
                     "workId": work.workId,
                     "contributorId": contributor_id,
                     "contributionType": contribution_type,
@@ -223,48 +269,66 @@ class UbiquityPressesLoader(BookLoader):
                     "lastName": last_name,
                     "fullName": full_name
                 }
-                contribution_id = self.thoth.create_contribution(contribution)
                 highest_contribution_ordinal += 1
+            resolved_contributions.append((existing_contribution, new_contribution, affiliations))
+
+        # create all new contributions in a single request; affiliations need their IDs
+        new_contribution_ids = iter(self.mutate_batch(
+            [("createContribution", new_contribution)
+             for _, new_contribution, _ in resolved_contributions if new_contribution]))
+        new_affiliations = []
+        for existing_contribution, new_contribution, affiliations in resolved_contributions:
+            if existing_contribution:
+                contribution_id = existing_contribution.contributionId
+                existing_affiliations = existing_contribution.affiliations
+            else:
+                contribution_id = next(new_contribution_ids)
+                existing_affiliations = []
 
-            existing_affiliations = next(
-                (c.affiliations for c in work.contributions if c.contributionId == contribution_id), [])
             highest_affiliation_ordinal = max(
                 (a.affiliationOrdinal for a in existing_affiliations), default=0)
+            affiliated_institutions = {a.institution.institutionId for a in existing_affiliations}
             for affiliation_string in affiliations:
-                affiliation = re.findall('"(.*?)"', affiliation_string)
-                position = affiliation[0].strip().strip('"')
-                institution_name = affiliation[1].strip().strip('"')
+                affiliation = self.quoted_regex.findall(affiliation_string)
+                position = affiliation[0].strip()
+                institution_name = affiliation[1].strip()
                 institution_doi = self.sanitise_doi(
-                    affiliation[2].strip().strip('"'))
-                ror = self.sanitise_ror(affiliation[3].strip().strip('"'))
-                country_code = affiliation[4].strip().strip('"')
+                    affiliation[2].strip())
+                ror = self.sanitise_ror(affiliation[3].strip())
+                country_code = affiliation[4].strip()
                 if not institution_name or institution_name == "n/a":
                     # Ubiquity have provided nationalities for some contributors
                     # by filling out affiliation with "n/a" - skip these
                     continue
 
-                # retrieve institution or create if it doesn't exist
-                if institution_name in self.all_institutions:
-                    institution_id = self.all_institutions[institution_name]
-                else:
-                    institution = {
-                        "institutionName": institution_name,
-                        "institutionDoi": institution_doi,
-                        "ror": ror,
-                        "countryCode": country_code,
-                    }
-                    institution_id = self.thoth.create_institution(institution)
-                    self.all_institutions[institution_name] = institution_id
+                with self.key_lock(("institution", institution_name)):
+                    # retrieve institution or create if it doesn't exist
+                    with self.cache_lock:
+                        institution_id = self.all_institutions.get(institution_name)
+                    if institution_id is None:
+                        institution = {
+                            "institutionName": institution_name,
+                            "institutionDoi": institution_doi,
+                            "ror": ror,
+                            "countryCode": country_code,
+                        }
+                        institution_id = self.thoth.create_institution(institution)
+                        with self.cache_lock:
+                            self.all_institutions[institution_name] = institution_id
 
-                if any(a.institution.institutionId == institution_id for a in existing_affiliations):
+                if institution_id in affiliated_institutions:
                     continue
+                affiliated_institutions.add(institution_id)
+                affiliation = {
+                    "contributionId": contribution_id,
+                    "institutionId": institution_id,
+                    "affiliationOrdinal": highest_affiliation_ordinal + 1,
+                    "position": position,
+                }
+                if new_contribution:
+                    # a new contribution has no affiliations whose ordinals could clash
+                    new_affiliations.append(affiliation)
                 else:
-                    affiliation = {
-                        "contributionId": contribution_id,
-                        "institutionId": institution_id,
-                        "affiliationOrdinal": highest_affiliation_ordinal + 1,
-                        "position": position,
-                    }
                     try:
                         self.thoth.create_affiliation(affiliation)
                     except ThothError as e:
@@ -274,28 +338,29 @@ class UbiquityPressesLoader(BookLoader):
                             affiliation.update(
                                 {"affiliationOrdinal": highest_affiliation_ordinal + 1})
                             self.thoth.create_affiliation(affiliation)
-                    highest_affiliation_ordinal += 1
+                highest_affiliation_ordinal += 1
+        # create the new contributions' affiliations in a single request
+        self.mutate_batch([("createAffiliation", affiliation) for affiliation in new_affiliations])
 
     def create_publications(self, row, work):
         """Creates all publications associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         work: current work
         """
-        column = self.data.at[row, "publications"] \
-            if pd.notna(self.data.at[row, "publications"]) else None
+        column = row.publications
         if not column or not column.strip():
             return
-        publications = re.findall(
-            '\\((.*?\\[.*?\\], ?\\[.*?\\])\\)', column)
+        publications = self.publications_regex.findall(column)
+        publications_by_type = {p.publicationType: p for p in work.publications}
         for publication_string in publications:
-            (prices_string, locations_string) = re.findall(
-                '\\[(.*?)\\], ?\\[(.*?)\\]', publication_string)[0]
-            prices = re.findall('\\((.*?)\\)', prices_string)
-            locations = re.findall('\\((.*?)\\)', locations_string)
-            publication = re.split(',', publication_string)
-            publication_type = publication[0].strip().strip('"').upper()
+            (prices_string, locations_string) = self.prices_locations_regex.findall(
+                publication_string)[0]
+            prices = self.tuple_regex.findall(prices_string)
+            locations = self.tuple_regex.findall(locations_string)
+            publication = self.split_fields(publication_string)
+            publication_type = publication[0].upper()
             try:
                 publication_type = self.publication_types[publication_type]
             except KeyError:
@@ -303,24 +368,25 @@ class UbiquityPressesLoader(BookLoader):
                 # attempt the Thoth request anyway
                 pass
 
-            existing_pub = next(
-                (p for p in work.publications if p.publicationType == publication_type), None)
+            existing_pub = publications_by_type.get(publication_type)
             if existing_pub:
                 publication_id = existing_pub.publicationId
+                existing_platforms = {l.locationPlatform for l in existing_pub.locations}
+                existing_urls = {(l.landingPage, l.fullTextUrl) for l in existing_pub.locations}
             else:
-                isbn = publication[1].strip().strip('"')
+                isbn = publication[1]
                 isbn = self.sanitise_isbn(isbn)
-                width_mm = publication[2].strip().strip('"')
-                width_cm = publication[3].strip().strip('"')
-                width_in = publication[4].strip().strip('"')
-                height_mm = publication[5].strip().strip('"')
-                height_cm = publication[6].strip().strip('"')
-                height_in = publication[7].strip().strip('"')
-                depth_mm = publication[8].strip().strip('"')
-                depth_cm = publication[9].strip().strip('"')
-                depth_in = publication[10].strip().strip('"')
-                weight_g = publication[11].strip().strip('"')
-                weight_oz = publication[12].strip().strip('"')
+                width_mm = publication[2]
+                width_cm = publication[3]
+                width_in = publication[4]
+                height_mm = publication[5]
+                height_cm = publication[6]
+                height_in = publication[7]
+                depth_mm = publication[8]
+                depth_cm = publication[9]
+                depth_in = publication[10]
+                weight_g = publication[11]
+                weight_oz = publication[12]
                 publication = {
                     "workId": work.workId,
                     "publicationType": publication_type,
@@ -339,10 +405,11 @@ class UbiquityPressesLoader(BookLoader):
                 }
                 publication_id = self.thoth.create_publication(publication)
 
+            new_prices = []
             for price_string in prices:
-                price = re.split(',', price_string)
-                currency_code = price[0].strip().strip('"')
-                unit_price = price[1].strip().strip('"')
+                price = self.split_fields(price_string)
+                currency_code = price[0]
+                unit_price = price[1]
                 unit_price = self.sanitise_price(unit_price)
                 # No point trying to create zero prices (not allowed in Thoth)
                 if unit_price and (unit_price != 0.0):
@@ -351,24 +418,25 @@ class UbiquityPressesLoader(BookLoader):
                         "currencyCode": currency_code,
                         "unitPrice": unit_price,
                     }
-                    self.thoth.create_price(price)
+                    new_prices.append(price)
+            self.mutate_batch([("createPrice", price) for price in new_prices])
 
             # Order in which locations are added is important -
             # store them up rather than adding one-by-one
             new_canonical_location = None
             new_non_canonical_locations = []
             for location_string in locations:
-                location = re.split(',', location_string)
+                location = self.split_fields(location_string)
                 landing_page = self.sanitise_url(
-                    location[0].strip().strip('"'))
+                    location[0])
                 full_text_url = self.sanitise_url(
-                    location[1].strip().strip('"'))
-                platform = location[2].strip().strip('"')
-                is_canonical = location[3].strip().strip('"')
+                    location[1])
+                platform = location[2]
+                is_canonical = location[3]
 
-                if existing_pub and any(l.locationPlatform == platform for l in existing_pub.locations):
+                if existing_pub and platform in existing_platforms:
                     if platform == "OTHER":
-                        if any(l.landingPage == landing_page and l.fullTextUrl == full_text_url for l in existing_pub.locations):
+                        if (landing_page, full_text_url) in existing_urls:
                             continue
                     else:
                         # Only one location per platform (other than OTHER) can be added
@@ -419,33 +487,35 @@ class UbiquityPressesLoader(BookLoader):
                             0)
                         new_canonical_location.update({"canonical": "true"})
 
+            # mutations in a batch are executed in order, so the canonical location still goes first
+            new_locations = new_non_canonical_locations
             if new_canonical_location:
-                self.thoth.create_location(new_canonical_location)
-
-            for new_location in new_non_canonical_locations:
-                self.thoth.create_location(new_location)
+                new_locations = [new_canonical_location] + new_locations
+            self.mutate_batch([("createLocation", location) for location in new_locations])
 
     def create_languages(self, row, work):
         """Creates all languages associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         work: current work
         """
-        column = self.data.at[row, "languages"] \
-            if pd.notna(self.data.at[row, "languages"]) else None
+        column = row.languages
         if not column or not column.strip():
             return
-        languages = re.findall('\\((.*?)\\)', column)
+        languages = self.tuple_regex.findall(column)
+        language_codes = {l.languageCode for l in work.languages}
+        new_languages = []
         for language_string in languages:
-            language = re.split(',', language_string)
-            language_relation = language[0].strip().strip('"').upper()
-            language_code = language[1].strip().strip('"').upper()
-            is_main = language[2].strip().strip('"')
+            language = self.split_fields(language_string)
+            language_relation = language[0].upper()
+            language_code = language[1].upper()
+            is_main = language[2]
 
             # skip this language if the work already has a language with that code
-            if any(l.languageCode == language_code for l in work.languages):
+            if language_code in language_codes:
                 continue
+            language_codes.add(language_code)
 
             language = {
                 "workId": work.workId,
@@ -453,35 +523,31 @@ class UbiquityPressesLoader(BookLoader):
                 "languageCode": language_code,
                 "mainLanguage": is_main,
             }
-            self.thoth.create_language(language)
+            new_languages.append(language)
+        self.mutate_batch([("createLanguage", language) for language in new_languages])
 
     def create_subjects(self, row, work):
         """Creates all subjects associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         work: current work
         """
-        for stype in ["bic", "thema", "bisac", "lcc", "custom_categories", "keywords"]:
-            column = self.data.at[row, stype] \
-                if pd.notna(self.data.at[row, stype]) else None
+        subject_keys = {(s.subjectType, s.subjectCode) for s in work.subjects}
+        new_subjects = []
+        for stype, subject_type in self.subject_columns.items():
+            column = getattr(row, stype)
             if not column or not column.strip():
                 continue
-            codes = re.findall('"(.*?)"', column)
+            codes = self.quoted_regex.findall(column)
             for index, code in enumerate(codes):
-                if stype == "custom_categories":
-                    subject_type = "CUSTOM"
-                elif stype == "keywords":
-                    subject_type = "KEYWORD"
-                else:
-                    subject_type = stype.upper()
                 subject_code = code.strip()
 
                 # skip this subject if the work already has a subject
                 # with that subject type/subject code combination
-                if any((s.subjectCode == subject_code and s.subjectType == subject_type
-                        for s in work.subjects)):
+                if (subject_type, subject_code) in subject_keys:
                     continue
+                subject_keys.add((subject_type, subject_code))
 
                 subject = {
                     "workId": work.workId,
@@ -489,75 +555,63 @@ class UbiquityPressesLoader(BookLoader):
                     "subjectCode": subject_code,
                     "subjectOrdinal": index + 1,
                 }
-                self.thoth.create_subject(subject)
+                new_subjects.append(subject)
+        self.mutate_batch([("createSubject", subject) for subject in new_subjects])
 
     def create_relations(self, row, relator_work):
         """Creates all relations associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         relator_work: current work
         """
-        column = self.data.at[row, "relations"] \
-            if pd.notna(self.data.at[row, "relations"]) else None
+        column = row.relations
         if not column or not column.strip():
             return
-        relations = re.findall('\\((".*?")\\)', column)
-        highest_child_ordinal = max(
-            (r.relationOrdinal for r in relator_work.relations if r.relationType == "HAS_CHILD"), default=0)
+        relations = self.quoted_tuple_regex.findall(column)
+        if not relations:
+            return
+        related_dois = {r.relatedWork.doi.rstrip('/') for r in relator_work.relations}
+        child_ordinals = {r.relationOrdinal for r in relator_work.relations if r.relationType == "HAS_CHILD"}
+        highest_child_ordinal = max(child_ordinals, default=0)
+        # new child works inherit these from the current work
+        child_work = {
+            **self.child_work_template,
+            "workStatus": relator_work.workStatus,
+            "imprintId": relator_work.imprintId,
+            "publicationDate": relator_work.publicationDate,
+            "place": relator_work.place,
+            "license": relator_work.license,
+        }
         for relation_string in relations:
-            relation = re.findall('"(.*?)"', relation_string)
-            relation_title = relation[0].strip().strip('"')
-            doi = self.sanitise_doi(relation[1].strip().strip('"'))
-            relation_type = relation[2].strip().strip('"').upper()
-            relation_ordinal = int(relation[3].strip().strip('"'))
+            relation = self.quoted_regex.findall(relation_string)
+            relation_title = relation[0].strip()
+            doi = self.sanitise_doi(relation[1].strip())
+            relation_type = relation[2].strip().upper()
+            relation_ordinal = int(relation[3].strip())
 
             # skip this relation if the work already has a relation with that DOI
-            if any(r.relatedWork.doi.rstrip('/') == doi.rstrip('/') for r in relator_work.relations):
+            if doi.rstrip('/') in related_dois:
                 continue
 
             if relation_type == "HAS_CHILD":
-                try:
-                    # Find the existing child work, if any
-                    related_work_id = self.thoth.work_by_doi(doi).workId
-                except (IndexError, AttributeError, ThothError):
-                    # Create a new child work which inherits from the current work
-                    related_work = {
-                        "workType": "BOOK_CHAPTER",
-                        "workStatus": relator_work.workStatus,
-                        "fullTitle": relation_title,
-                        "title": relation_title,
-                        "subtitle": None,
-                        "reference": None,
-                        "edition": None,
-                        "imprintId": relator_work.imprintId,
-                        "doi": doi,
-                        "publicationDate": relator_work.publicationDate,
-                        "place": relator_work.place,
-                        "pageCount": None,
-                        "pageBreakdown": None,
-                        "firstPage": None,
-                        "lastPage": None,
-                        "pageInterval": None,
-                        "imageCount": None,
-                        "tableCount": None,
-                        "audioCount": None,
-                        "videoCount": None,
-                        "license": relator_work.license,
-                        "copyrightHolder": None,
-                        "landingPage": None,
-                        "lccn": None,
-                        "oclc": None,
-                        "shortAbstract": None,
-                        "longAbstract": None,
-                        "generalNote": None,
-                        "toc": None,
-                        "coverUrl": None,
-                        "coverCaption": None,
-                    }
-                    related_work_id = self.thoth.create_work(related_work)
+                # Find the existing child work, if any, holding the DOI's lock until it is created
+                # so that two books listing the same chapter can't both create it
+                with self.key_lock(("doi", doi)):
+                    related_work_id = self.find_work_id(doi)
+                    if related_work_id is None:
+                        # Create a new child work which inherits from the current work
+                        related_work = {
+                            **child_work,
+                            "fullTitle": relation_title,
+                            "title": relation_title,
+                            "doi": doi,
+                        }
+                        related_work_id = self.thoth.create_work(related_work)
+                        with self.cache_lock:
+                            self.all_works[doi] = related_work_id
 
-                if any(r.relationOrdinal == relation_ordinal and r.relationType == "HAS_CHILD" for r in relator_work.relations):
+                if relation_ordinal in child_ordinals:
                     # Avoid clashes if a child with this ordinal already exists
                     # but is linked to a different DOI - just use next available
                     relation_ordinal = highest_child_ordinal + 1
@@ -571,8 +625,7 @@ class UbiquityPressesLoader(BookLoader):
                     "relationOrdinal": relation_ordinal,
                 }
                 self.thoth.create_work_relation(work_relation)
+                child_ordinals.add(relation_ordinal)
 
             else:
-                # TODO proper logging
-                print("Unhandled relation type: %s" % relation_type)
-                raise
+                raise ValueError(f"Unhandled relation type: {relation_type}")
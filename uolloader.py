@@ -2,8 +2,6 @@
 """Load University of London Press metadata into Thoth"""
 
 import logging
-import requests
-import itertools
 from bookloader import BookLoader
 from onix3 import Onix3Record
 
@@ -23,33 +21,23 @@ class UOLLoader(BookLoader):
         # Default currency is also supplied, but no records in dataset have price amount without currency
         # default_currency = self.data.header.default_currency_code.value.value
         # there's one publication per ONIX product, all related using a common ID within <RelatedWork>.
-        # sort all related products into their own list: [[product, product], [product, product]]
-        products = [Onix3Record(product)
-                    for product in self.data.no_product_or_product]
-        sorted_products = sorted(
-            products, key=lambda x: x.related_system_internal_identifier())
-        grouped_products = []
-        for key, group in itertools.groupby(sorted_products, key=lambda x: x.related_system_internal_identifier()):
-            grouped_products.append(list(group))
+        # bucket all related products into their own list in a single pass: [[product, product], [product, product]]
+        grouped_products = {}
+        for product in self.data.no_product_or_product:
+            record = Onix3Record(product)
+            grouped_products.setdefault(record.related_system_internal_identifier(), []).append(record)
+
+        works = [(self.get_canonical_record(product_list), product_list)
+                 for product_list in grouped_products.values()]
+        # resolve DOIs of works lacking a landing page concurrently, before the sequential loop
+        self.resolve_dois(
+            doi for doi in (self.get_fallback_doi(record) for record, _ in works) if doi)
 
         issues_to_create = []
-        for product_list in grouped_products:
-            if len(product_list) == 1:
-                canonical_record = product_list[0]
-            else:
-                # Where a PDF record is present, it's usually the most comprehensive
-                # Otherwise, no consistent pattern/differences are minor, so choose first record
-                # (Almost all fields are replicated across records in a group; occasionally
-                # DOI/licence/landing page are missing from some, or page counts/dates differ slightly)
-                try:
-                    canonical_record = [record for record in product_list
-                                        if self.publication_types[record.product_type()] == "PDF"][0]
-                except IndexError:
-                    canonical_record = product_list[0]
-
+        for canonical_record, product_list in works:
             work = self.get_work(canonical_record)
             work_id = self.thoth.create_work(work)
-            logging.info('workId: %s' % work_id)
+            logging.info("workId: %s", work_id)
             for record in product_list:
                 self.create_publications(record, work_id)
             self.create_contributors(canonical_record, work_id)
@@ -60,6 +48,33 @@ class UOLLoader(BookLoader):
 
         self.create_all_issues(issues_to_create)
 
+    def get_canonical_record(self, product_list):
+        """Returns the record from which work-level metadata should be taken
+
+        product_list: all onix records of the current work
+        """
+        if len(product_list) == 1:
+            return product_list[0]
+        # Where a PDF record is present, it's usually the most comprehensive
+        # Otherwise, no consistent pattern/differences are minor, so choose first record
+        # (Almost all fields are replicated across records in a group; occasionally
+        # DOI/licence/landing page are missing from some, or page counts/dates differ slightly)
+        return next((record for record in product_list
+                     if self.publication_types[record.product_type()] == "PDF"), product_list[0])
+
+    @staticmethod
+    def get_fallback_doi(record):
+        """Returns the DOI of a record with no landing page, which must be resolved to obtain one
+
+        record: current onix record
+        """
+        if record.available_content_url() is not None:
+            return None
+        try:
+            return record.doi()
+        except IndexError:
+            return None
+
     def get_work(self, record):
         """Returns a dictionary with all attributes of a 'work'
 
@@ -76,7 +91,7 @@ class UOLLoader(BookLoader):
         if landing_page is None and doi is not None:
             # Backstop: resolve DOI to obtain landing page
             # (this takes some time and is not always accurate)
-            landing_page = requests.get(doi).url
+            landing_page = self.resolve_doi(doi)
 
         edition = record.edition_number()
         if edition is None:
@@ -133,24 +148,6 @@ class UOLLoader(BookLoader):
 
         work_id: previously obtained ID of the current work
         """
-        def create_price():
-            price = {
-                "publicationId": publication_id,
-                "currencyCode": currency_code,
-                "unitPrice": unit_price,
-            }
-            self.thoth.create_price(price)
-
-        def create_location():
-            location = {
-                "publicationId": publication_id,
-                "landingPage": url,
-                "fullTextUrl": url,
-                "locationPlatform": "OTHER",
-                "canonical": canonical,
-            }
-            self.thoth.create_location(location)
-
         publication = {
             "workId": work_id,
             "publicationType": self.publication_types[record.product_type()],
@@ -178,12 +175,20 @@ class UOLLoader(BookLoader):
 
         # Records frequently include the same currency/price pair multiple times
         # (representing different suppliers): remove duplicates
-        for currency_code, unit_price in list(set(record.prices())):
-            create_price()
-
-        for index, url in enumerate(record.full_text_urls()):
-            canonical = "true" if index == 0 else "false"
-            create_location()
+        prices = [("createPrice", {
+            "publicationId": publication_id,
+            "currencyCode": currency_code,
+            "unitPrice": unit_price,
+        }) for currency_code, unit_price in set(record.prices())]
+        locations = [("createLocation", {
+            "publicationId": publication_id,
+            "landingPage": url,
+            "fullTextUrl": url,
+            "locationPlatform": "OTHER",
+            "canonical": "true" if index == 0 else "false",
+        }) for index, url in enumerate(record.full_text_urls())]
+        # prices and locations only depend on the publication: create them all in one request
+        self.mutate_batch(prices + locations)
 
     def create_contributors(self, record, work_id):
         """Creates all contributions associated with the current work
@@ -192,6 +197,8 @@ class UOLLoader(BookLoader):
 
         work_id: previously obtained ID of the current work
         """
+        # (contribution, contributor record) pairs, created together once all contributors are resolved
+        contributions = []
         for contributor_record in record.contributors():
             given_name = None
             try:
@@ -204,23 +211,13 @@ class UOLLoader(BookLoader):
             full_name = Onix3Record.get_person_name(contributor_record)
             orcid = Onix3Record.get_orcid(contributor_record)
 
-            if orcid and orcid in self.all_contributors:
-                contributor_id = self.all_contributors[orcid]
-            elif full_name in self.all_contributors:
-                contributor_id = self.all_contributors[full_name]
-            else:
-                contributor = {
-                    "firstName": given_name,
-                    "lastName": family_name,
-                    "fullName": full_name,
-                    "orcid": orcid,
-                    "website": Onix3Record.get_website(contributor_record),
-                }
-                contributor_id = self.thoth.create_contributor(contributor)
-                # cache new contributor
-                self.all_contributors[full_name] = contributor_id
-                if orcid:
-                    self.all_contributors[orcid] = contributor_id
+            contributor_id = self.resolve_contributor(full_name, orcid, lambda: {
+                "firstName": given_name,
+                "lastName": family_name,
+                "fullName": full_name,
+                "orcid": orcid,
+                "website": Onix3Record.get_website(contributor_record),
+            })
 
             contribution = {
                 "workId": work_id,
@@ -233,8 +230,13 @@ class UOLLoader(BookLoader):
                 "lastName": family_name,
                 "fullName": full_name,
             }
-            contribution_id = self.thoth.create_contribution(contribution)
+            contributions.append((contribution, contributor_record))
 
+        # create all contributions in one request, then all their affiliations in another
+        contribution_ids = self.mutate_batch(
+            [("createContribution", contribution) for contribution, _ in contributions])
+        affiliations = []
+        for (_, contributor_record), contribution_id in zip(contributions, contribution_ids):
             for index, (position, institution_string) in enumerate(Onix3Record.get_affiliations_with_positions(contributor_record)):
                 if institution_string is None:
                     # can't add a position without an institution
@@ -243,7 +245,7 @@ class UOLLoader(BookLoader):
                 # Institution string sometimes concludes with country name in brackets
                 # TODO could potentially extract this country name for use in creating
                 # new institution - but would have to convert to country code
-                institution_name = institution_string.split('(')[0].rstrip()
+                institution_name = institution_string.partition('(')[0].rstrip()
 
                 # retrieve institution or create if it doesn't exist
                 if institution_name in self.all_institutions:
@@ -259,13 +261,13 @@ class UOLLoader(BookLoader):
                     # cache new institution
                     self.all_institutions[institution_name] = institution_id
 
-                affiliation = {
+                affiliations.append(("createAffiliation", {
                     "contributionId": contribution_id,
                     "institutionId": institution_id,
                     "position": position,
                     "affiliationOrdinal": index + 1
-                }
-                self.thoth.create_affiliation(affiliation)
+                }))
+        self.mutate_batch(affiliations)
 
     def create_languages(self, record, work_id, default_language):
         """Creates language associated with the current work
@@ -279,14 +281,12 @@ class UOLLoader(BookLoader):
         languages = record.language_codes_and_roles()
         if len(languages) == 0:
             languages.append((default_language, "ORIGINAL"))
-        for (language_code, language_relation) in languages:
-            language = {
-                "workId": work_id,
-                "languageCode": language_code,
-                "languageRelation": language_relation,
-                "mainLanguage": "true"
-            }
-            self.thoth.create_language(language)
+        self.mutate_batch([("createLanguage", {
+            "workId": work_id,
+            "languageCode": language_code,
+            "languageRelation": language_relation,
+            "mainLanguage": "true"
+        }) for (language_code, language_relation) in languages])
 
     def create_subjects(self, record, work_id):
         """Creates all subjects associated with the current work
@@ -295,21 +295,24 @@ class UOLLoader(BookLoader):
 
         work_id: previously obtained ID of the current work
         """
+        subjects = []
+
         def process_codes(codes, subject_type):
             for index, subject_code in enumerate(codes):
-                subject = {
+                subjects.append(("createSubject", {
                     "workId": work_id,
                     "subjectType": subject_type,
                     "subjectCode": subject_code,
                     "subjectOrdinal": index + 1
-                }
-                self.thoth.create_subject(subject)
+                }))
 
         process_codes(record.thema_codes(), "THEMA")
         process_codes(record.bisac_codes(), "BISAC")
         process_codes(record.bic_codes(), "BIC")
         process_codes(record.keywords_from_text(), "KEYWORD")
         process_codes(record.custom_codes(), "CUSTOM")
+        # create subjects of every type in a single request
+        self.mutate_batch(subjects)
 
     def extract_issues_data(self, record, work_id):
         """
@@ -328,7 +331,7 @@ class UOLLoader(BookLoader):
                 issn = BookLoader.sanitise_issn(
                     Onix3Record.get_issn(series_record))
             except ValueError as e:
-                logging.error(f"{e} ({work_id})")
+                logging.error("%s (%s)", e, work_id)
 
             # TODO for first import there will be no existing UoL series;
             # if updating for recurring import, initialise self.all_series first
@@ -369,12 +372,12 @@ class UOLLoader(BookLoader):
 
         issues_to_create: list of dicts representing issues to create
         """
-        sorted_issues = sorted(issues_to_create, key=lambda x: x['series_id'])
-        grouped_issues = []
-        for key, group in itertools.groupby(sorted_issues, key=lambda x: x['series_id']):
-            grouped_issues.append(list(group))
+        # bucket issues by series in a single pass (no sort needed just to group them)
+        grouped_issues = {}
+        for issue_data in issues_to_create:
+            grouped_issues.setdefault(issue_data['series_id'], []).append(issue_data)
 
-        for issue_list in grouped_issues:
+        for issue_list in grouped_issues.values():
             # Sorts issues in same series by ordinal, pushing Nones to start of list
             # Retains series order but avoids problems with missing/clashing ordinals
             sorted_list = sorted(issue_list, key=lambda x: (
@@ -388,4 +391,4 @@ class UOLLoader(BookLoader):
                 try:
                     self.thoth.create_issue(issue)
                 except Exception as e:
-                    logging.error(f"{e} ({issue_data['work_id']})")
+                    logging.error("%s (%s)", e, issue_data["work_id"])
@@ -2,7 +2,7 @@
 """Load UWP metadata into Thoth"""
 
 import logging
-import requests
+import re
 from bookloader import BookLoader
 
 
@@ -13,17 +13,46 @@ class UWPLoader(BookLoader):
     publisher_name = "University of Westminster Press"
     publisher_shortname = "UWP"
     publisher_url = "https://www.uwestminsterpress.co.uk/"
+    year_regex = re.compile(r'\d{4}')
+    # leading quotes and the trailing attribution wrapped around abstracts
+    abstract_regex = re.compile(r'^"+|"--Publisher\'s website\.')
+    # a GBP amount, optionally followed by the format it applies to, e.g. "£25.00 (paperback)"
+    price_regex = re.compile(r'£\s*(\d+(?:\.\d+)?)\s*(?:\((\w+)\))?')
+    # full licence statements (MARC 540) and the licence URL each stands for
+    licenses = {
+        "Open access. This is an Open Access book distributed under the terms of the Creative "
+        "Commons Attribution 4.0 license (unless stated otherwise), which permits "
+        "unrestricted use, distribution and reproduction in any medium, provided the original "
+        "work is properly cited. Copyright is retained by the author(s).":
+            "http://creativecommons.org/licenses/by/4.0/",
+        "Open access. This book distributed under the terms of the Creative Commons "
+        "Attribution + Noncommercial + NoDerivatives 4.0 license. Copyright is retained by "
+        "the author(s).":
+            "https://creativecommons.org/licenses/by-nc-nd/4.0/",
+    }
 
     def run(self):
         """Process CSV and call Thoth to insert its data"""
-        for record in self.data:
-            work = self.get_work(record, self.imprint_id)
-            work_id = self.thoth.create_work(work)
-            logging.info('workId: %s' % work_id)
-            self.create_publications(record, work_id)
-            self.create_languages(record, work_id)
-            self.create_subjects(record, work_id)
-            self.create_contributors(record, work_id)
+        # resolve all landing pages concurrently up front; get_work then reads them from the cache
+        self.resolve_dois(record.get('856').get('u') for record in self.data)
+        # likewise create every contributor new to Thoth in a few batched requests
+        self.create_missing_contributors(
+            contributor for record in self.data for _, contributor, _ in self.get_contributors(record))
+        # works are independent of each other: ingest them concurrently, if max_workers allows
+        self.process_records(self.data, self.process_record)
+
+    def process_record(self, record):
+        """Create a single work and its associated data
+
+        record: current MARC record
+        """
+        work = self.get_work(record, self.imprint_id)
+        work_id = self.thoth.create_work(work)
+        logging.info("workId: %s", work_id)
+        self.create_publications(record, work_id)
+        self.create_languages(record, work_id)
+        self.create_subjects(record, work_id)
+        self.create_contributors(record, work_id)
 
     def get_work(self, record, imprint_id):
         """Returns a dictionary with all attributes of a 'work'
@@ -34,43 +63,37 @@ class UWPLoader(BookLoader):
         """
         reference = record.get('001').value()
         doi = record.get('856').get('u')
-        try:
-            title = record.get('245').get('a').rstrip("\\/:").strip()
-            subtitle = record.get('245').get('b').rstrip("\\/:").strip()
-        except (ValueError, AttributeError):
-            title = record.get('245').get('a').rstrip("\\/:").strip()
-            subtitle = None
+        # look each field up once: pymarc scans the record's fields on every get
+        title_field = record.get('245')
+        publication_field = record.get('264')
+        bibliography_field = record.get('504')
+
+        title = title_field.get('a').rstrip("\\/:").strip()
+        subtitle = title_field.get('b')
+        if subtitle is not None:
+            subtitle = subtitle.rstrip("\\/:").strip()
         title = self.sanitise_title(title, subtitle)
 
         # only year is included
-        publication_year = record.get('264').get('c').replace("[", "").replace("]", "").replace(".", "")
+        publication_year = self.year_regex.search(publication_field.get('c')).group()
         publication_date = "%s-01-01" % publication_year
 
         page_count, page_breakdown = self.parse_page_string(record.get('300').get('a'))
-        place = record.get('264').get('a').rstrip(" :")
-        abstract = record.get('520').get('a').lstrip('"').replace('"--Publisher\'s website.', '')
-        bibliography_note = record.get('504').get('a') if record.get('504') else None
+        place = publication_field.get('a').rstrip(" :")
+        abstract = self.abstract_regex.sub('', record.get('520').get('a'))
+        bibliography_note = bibliography_field.get('a') if bibliography_field else None
 
         license_statement = record.get('540').value()
-        if license_statement == "Open access. This is an Open Access book distributed under the terms of the Creative " \
-                                "Commons Attribution 4.0 license (unless stated otherwise), which permits " \
-                                "unrestricted use, distribution and reproduction in any medium, provided the original " \
-                                "work is properly cited. Copyright is retained by the author(s).":
-            cc_license = "http://creativecommons.org/licenses/by/4.0/"
-        elif license_statement == "Open access. This book distributed under the terms of the Creative Commons " \
-                                  "Attribution + Noncommercial + NoDerivatives 4.0 license. Copyright is retained by " \
-                                  "the author(s).":
-            cc_license = "https://creativecommons.org/licenses/by-nc-nd/4.0/"
-        else:
-            logging.error("Unrecognised license: %s" % license_statement)
-            raise
+        cc_license = self.licenses.get(license_statement)
+        if cc_license is None:
+            raise ValueError(f"Unrecognised license: {license_statement}")
 
-        roles = [subfield for field in record.get_fields('100', '700') for subfield in field.get_subfields('e')]
-        work_type = "EDITED_BOOK" if any('editor' in role for role in roles) else "MONOGRAPH"
+        # a single case-insensitive search across all relator terms: "Editor." counts as well as "editor"
+        roles = "|".join(subfield for field in record.get_fields('100', '700') for subfield in field.get_subfields('e'))
+        work_type = "EDITED_BOOK" if "editor" in roles.casefold() else "MONOGRAPH"
 
         # resolve DOI to obtain landing page
-        response = requests.get(doi)
-        landing_page = response.url
+        landing_page = self.resolve_doi(doi)
 
         work = {
             "workType": work_type,
@@ -129,37 +152,50 @@ class UWPLoader(BookLoader):
                 (hardback, paperback) = physical
                 publications.append(("PAPERBACK", self.sanitise_isbn(paperback)))
                 publications.append(("HARDBACK", self.sanitise_isbn(hardback)))
-        prices = [item for item in record.get('037').get_subfields('c') if '£' in item and item != '£0']
+        prices = self.get_prices(record)
 
-        for ptype, isbn in publications:
-            publication = {
-                "workId": work_id,
-                "publicationType": ptype,
-                "isbn": isbn,
-                "widthMm": None,
-                "widthIn": None,
-                "heightMm": None,
-                "heightIn": None,
-                "depthMm": None,
-                "depthIn": None,
-                "weightG": None,
-                "weightOz": None,
-            }
-            publication_id = self.thoth.create_publication(publication)
-            if ptype == "PAPERBACK" and prices:
-                price = {
-                    "publicationId": publication_id,
-                    "currencyCode": "GBP",
-                    "unitPrice": prices[0].replace("£", "").replace(" (paperback)", "")
-                }
-                self.thoth.create_price(price)
-            elif ptype == "HARDBACK" and len(prices) == 2:
-                price = {
-                    "publicationId": publication_id,
-                    "currencyCode": "GBP",
-                    "unitPrice": prices[1].replace("£", "").replace(" (hardback)", "")
-                }
-                self.thoth.create_price(price)
+        new_publications = [{
+            "workId": work_id,
+            "publicationType": ptype,
+            "isbn": isbn,
+            "widthMm": None,
+            "widthIn": None,
+            "heightMm": None,
+            "heightIn": None,
+            "depthMm": None,
+            "depthIn": None,
+            "weightG": None,
+            "weightOz": None,
+        } for ptype, isbn in publications]
+        # create all publications in one request, then all their prices in another
+        publication_ids = self.mutate_batch(
+            [("createPublication", publication) for publication in new_publications])
+        new_prices = [{
+            "publicationId": publication_id,
+            "currencyCode": "GBP",
+            "unitPrice": prices[ptype],
+        } for (ptype, _), publication_id in zip(publications, publication_ids) if ptype in prices]
+        self.mutate_batch([("createPrice", price) for price in new_prices])
+
+    def get_prices(self, record):
+        """Returns a dictionary of publication type to GBP price (MARC 037$c), ignoring zero prices
+
+        record: current MARC record
+        """
+        prices = {}
+        unlabelled = []
+        for item in record.get('037').get_subfields('c'):
+            match = self.price_regex.search(item)
+            if not match or float(match.group(1)) == 0:
+                continue
+            if match.group(2):
+                prices.setdefault(match.group(2).upper(), match.group(1))
+            else:
+                unlabelled.append(match.group(1))
+        # prices without a format follow the catalogue's convention: paperback first, then hardback
+        for ptype, price in zip(("PAPERBACK", "HARDBACK"), unlabelled):
+            prices.setdefault(ptype, price)
+        return prices
 
     def create_languages(self, record, work_id):
         """Creates all languages associated with the current work
@@ -168,10 +204,12 @@ class UWPLoader(BookLoader):
 
         work_id: previously obtained ID of the current work
         """
-        work_lang = record.get('008').value()[-5:-2].upper()
+        # language of the item is at positions 35-37 of the fixed-length data elements
+        work_lang = record.get('008').data[35:38].strip().upper()
         original_lang = None
-        if record.get('041'):
-            original_lang = record.get('041').get('h').upper()
+        language_field = record.get('041')
+        if language_field:
+            original_lang = language_field.get('h').strip().upper()
 
         if work_lang and original_lang:
             languages = [
@@ -181,14 +219,12 @@ class UWPLoader(BookLoader):
         else:
             languages = [("ORIGINAL", work_lang)]
 
-        for lang_relation, language in languages:
-            language = {
-                "workId": work_id,
-                "languageCode": language.strip().upper(),
-                "languageRelation": lang_relation,
-                "mainLanguage": "true"
-            }
-            self.thoth.create_language(language)
+        self.mutate_batch([("createLanguage", {
+            "workId": work_id,
+            "languageCode": language,
+            "languageRelation": lang_relation,
+            "mainLanguage": "true"
+        }) for lang_relation, language in languages])
 
     def create_subjects(self, record, work_id):
         """Creates all subjects associated with the current work
@@ -205,32 +241,27 @@ class UWPLoader(BookLoader):
         }
         self.thoth.create_subject(subject)
 
-    def create_contributors(self, record, work_id):
-        """Creates all contributions associated with the current work
+    def get_contributors(self, record):
+        """Returns (ordinal, contributor, contribution type) for every contributor of the current work
 
         record: current MARC record
-
-        work_id: previously obtained ID of the current work
         """
         contributors = []
         for field in record.get_fields('100', '700'):
             name = field.get('a').rstrip(',')
             for role in field.get_subfields('e'):
-                contributors.append((name, role.rstrip(',').rstrip('.')))
+                contributors.append((name, role))
 
+        parsed = []
         for index, (contributor, role) in enumerate(contributors):
             if not contributor:
                 continue
 
-            names = contributor.split(",")
-            surname = names[0].strip()
-            if len(names) == 1:
-                name = None
-                fullname = surname
-            elif len(names) == 2:
-                name = names[1].strip()
-                surname = names[0].strip()
-                fullname = "{} {}".format(name, surname)
+            contribution_type = self.get_contribution_type(role)
+            if contribution_type is None:
+                logging.error("Unrecognised contributor role, skipping %s: %s", contributor, role)
+                continue
+            name, surname, fullname = self.split_name(contributor)
             contributor = {
                 "firstName": name,
                 "lastName": surname,
@@ -239,24 +270,32 @@ class UWPLoader(BookLoader):
                 "website": None
 
             }
-            if fullname not in self.all_contributors:
-                contributor_id = self.thoth.create_contributor(
-                    contributor)
-                self.all_contributors[fullname] = contributor_id
-            else:
-                contributor_id = self.all_contributors[fullname]
+            parsed.append((index + 1, contributor, contribution_type))
+        return parsed
+
+    def create_contributors(self, record, work_id):
+        """Creates all contributions associated with the current work
+
+        record: current MARC record
+
+        work_id: previously obtained ID of the current work
+        """
+        contributions = []
+        for ordinal, contributor, contribution_role in self.get_contributors(record):
+            # contributors are normally created up front in run; this only creates stragglers
+            contributor_id = self.resolve_contributor(contributor["fullName"], None, lambda: contributor)
 
-            contribution_role = self.contribution_types[role]
             is_main = "true" if contribution_role in ["AUTHOR", "EDITOR"] else "false"
-            contribution = {
+            contributions.append({
                 "workId": work_id,
                 "contributorId": contributor_id,
                 "contributionType": contribution_role,
                 "mainContribution": is_main,
-                "contributionOrdinal": index + 1,
+                "contributionOrdinal": ordinal,
                 "biography": None,
-                "firstName": name,
-                "lastName": surname,
-                "fullName": fullname,
-            }
-            self.thoth.create_contribution(contribution)
+                "firstName": contributor["firstName"],
+                "lastName": contributor["lastName"],
+                "fullName": contributor["fullName"],
+            })
+        # create all of the work's contributions in a single request
+        self.mutate_batch([("createContribution", contribution) for contribution in contributions])
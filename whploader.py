@@ -11,43 +11,57 @@ class WHPLoader(BookLoader):
     publisher_name = "The White Horse Press"
     publisher_shortname = "WHP"
     publisher_url = "https://www.whpress.co.uk/"
+    # in subject ordinal order
+    bisac_columns = ["BISAC 1 (required)", "BISAC 2", "BISAC 3", "BISAC 4", "BISAC 5"]
 
     def run(self):
         """Process CSV and call Thoth to insert its data"""
-        for row in self.data.index:
-            work = self.get_work(row, self.imprint_id)
-            work_id = self.thoth.create_work(work)
-            logging.info('workId: %s' % work_id)
-            self.create_publications(row, work_id)
-            self.create_languages(row, work_id)
-            self.create_subjects(row, work_id)
-            self.create_contributors(row, work_id)
+        # plain dicts keyed by column name are much cheaper to read than per-cell DataFrame.at lookups
+        rows = self.data.to_dict("records")
+        # create every contributor new to Thoth up front, in a few batched requests
+        self.create_missing_contributors(
+            contributor for row in rows for _, contributor, _ in self.get_contributors(row))
+        # works are independent of each other: ingest them concurrently, if max_workers allows
+        self.process_records(rows, self.process_row)
+
+    def process_row(self, row):
+        """Create a single work and its associated data
+
+        row: current CSV row
+        """
+        work = self.get_work(row, self.imprint_id)
+        work_id = self.thoth.create_work(work)
+        logging.info("workId: %s", work_id)
+        self.create_publications(row, work_id)
+        self.create_languages(row, work_id)
+        self.create_subjects(row, work_id)
+        self.create_contributors(row, work_id)
 
     def get_work(self, row, imprint_id):
         """Returns a dictionary with all attributes of a 'work'
 
-        row: current row number
+        row: current CSV row
 
         imprint_id: previously obtained ID of this work's imprint
         """
         try:
-            title = self.data.at[row, 'Distinctive Title (required)'].strip()
-            subtitle = self.data.at[row, 'Subtitle'].strip()
+            title = row['Distinctive Title (required)'].strip()
+            subtitle = row['Subtitle'].strip()
         except (ValueError, AttributeError):
-            title = self.data.at[row, 'Distinctive Title (required)'].strip()
+            title = row['Distinctive Title (required)'].strip()
             subtitle = None
         title = self.sanitise_title(title, subtitle)
 
-        publication_date = self.sanitise_date(self.data.at[row, "Publication Date (required)"])
+        publication_date = self.sanitise_date(row["Publication Date (required)"])
 
-        page_count = int(self.data.at[row, "Number of Pages"]) \
-            if self.data.at[row, "Number of Pages"] else None
-        cc_license = self.data.at[row, "Creative Commons License URL for Open Access Book"].strip() \
-            if self.data.at[row, "Creative Commons License URL for Open Access Book"] else None
-        abstract = self.data.at[row, "Publisher Description of item (required)"].strip() \
-            if self.data.at[row, "Publisher Description of item (required)"] else None
+        page_count = int(row["Number of Pages"]) \
+            if row["Number of Pages"] else None
+        cc_license = row["Creative Commons License URL for Open Access Book"].strip() \
+            if row["Creative Commons License URL for Open Access Book"] else None
+        abstract = row["Publisher Description of item (required)"].strip() \
+            if row["Publisher Description of item (required)"] else None
 
-        main_role = self.contribution_types[self.data.at[row, "Contributor Role 1 (required)"]]
+        main_role = self.get_contribution_type(row["Contributor Role 1 (required)"])
         work_type = "EDITED_BOOK" if main_role == "EDITOR" else "MONOGRAPH"
 
         work = {
@@ -90,45 +104,42 @@ class WHPLoader(BookLoader):
     def create_publications(self, row, work_id):
         """Creates all publications associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         work_id: previously obtained ID of the current work
         """
 
         publications = [
-            ("PAPERBACK", self.sanitise_isbn(self.data.at[row, "ISBN - PAPERBACK"])),
-            ("HARDBACK", self.sanitise_isbn(self.data.at[row, "ISBN - HARDCOVER"])),
-            ("PDF", self.sanitise_isbn(self.data.at[row, "ISBN - PDF"])),
+            ("PAPERBACK", self.sanitise_isbn(row["ISBN - PAPERBACK"])),
+            ("HARDBACK", self.sanitise_isbn(row["ISBN - HARDCOVER"])),
+            ("PDF", self.sanitise_isbn(row["ISBN - PDF"])),
         ]
 
-        for ptype, isbn in publications:
-            # some books are digital only, others do not have all formats
-            if not isbn:
-                continue
-            publication = {
-                "workId": work_id,
-                "publicationType": ptype,
-                "isbn": isbn,
-                "widthMm": None,
-                "widthIn": None,
-                "heightMm": None,
-                "heightIn": None,
-                "depthMm": None,
-                "depthIn": None,
-                "weightG": None,
-                "weightOz": None,
-            }
-            self.thoth.create_publication(publication)
+        # some books are digital only, others do not have all formats
+        self.mutate_batch([("createPublication", {
+            "workId": work_id,
+            "publicationType": ptype,
+            "isbn": isbn,
+            "widthMm": None,
+            "widthIn": None,
+            "heightMm": None,
+            "heightIn": None,
+            "depthMm": None,
+            "depthIn": None,
+            "weightG": None,
+            "weightOz": None,
+        }) for ptype, isbn in publications if isbn])
 
     def create_languages(self, row, work_id):
         """Creates all languages associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         work_id: previously obtained ID of the current work
         """
-        work_lang = self.data.at[row, "Language (required)"]
-        original_lang = self.data.at[row, "Original Language"]
+        # normalise codes once, so that blank cells count as missing
+        work_lang = (row["Language (required)"] or "").strip().upper()
+        original_lang = (row["Original Language"] or "").strip().upper()
 
         if work_lang and original_lang:
             languages = [
@@ -138,62 +149,50 @@ class WHPLoader(BookLoader):
         else:
             languages = [("ORIGINAL", work_lang)]
 
-        for lang_relation, language in languages:
-            language = {
-                "workId": work_id,
-                "languageCode": language.strip().upper(),
-                "languageRelation": lang_relation,
-                "mainLanguage": "true"
-            }
-            self.thoth.create_language(language)
+        self.mutate_batch([("createLanguage", {
+            "workId": work_id,
+            "languageCode": language,
+            "languageRelation": lang_relation,
+            "mainLanguage": "true"
+        }) for lang_relation, language in languages])
 
     def create_subjects(self, row, work_id):
         """Creates all subjects associated with the current work
 
-        row: current row number
+        row: current CSV row
 
         work_id: previously obtained ID of the current work
         """
-        bisac_codes = [self.data.at[row, "BISAC 1 (required)"], self.data.at[row, "BISAC 2"],
-                       self.data.at[row, "BISAC 3"], self.data.at[row, "BISAC 4"], self.data.at[row, "BISAC 5"]]
+        bisac_codes = [row[column] for column in self.bisac_columns]
 
-        for index, code in enumerate(bisac_codes):
-            if not code:
-                continue
-            subject = {
-                "workId": work_id,
-                "subjectType": "BISAC",
-                "subjectCode": code.strip(),
-                "subjectOrdinal": index + 1
-            }
-            self.thoth.create_subject(subject)
-
-    def create_contributors(self, row, work_id):
-        """Creates all contributions associated with the current work
+        self.mutate_batch([("createSubject", {
+            "workId": work_id,
+            "subjectType": "BISAC",
+            "subjectCode": code.strip(),
+            "subjectOrdinal": index + 1
+        }) for index, code in enumerate(bisac_codes) if code])
 
-        row: current row number
+    def get_contributors(self, row):
+        """Returns (ordinal, contributor, contribution type) for every contributor of the current work
 
-        work_id: previously obtained ID of the current work
+        row: current CSV row
         """
         contributors = [
-            (self.data.at[row, "Contributor 1 (required)"], self.data.at[row, "Contributor Role 1 (required)"]),
-            (self.data.at[row, "Contributor 2"], self.data.at[row, "Contributor Role 2"]),
-            (self.data.at[row, "Contributor 3"], self.data.at[row, "Contributor Role 3"]),
+            (row["Contributor 1 (required)"], row["Contributor Role 1 (required)"]),
+            (row["Contributor 2"], row["Contributor Role 2"]),
+            (row["Contributor 3"], row["Contributor Role 3"]),
         ]
 
+        parsed = []
         for index, (contributor, contribution_role) in enumerate(contributors):
             if not contributor:
                 continue
 
-            names = contributor.split(",")
-            surname = names[0].strip()
-            if len(names) == 1:
-                name = None
-                fullname = surname
-            elif len(names) == 2:
-                name = names[1].strip()
-                surname = names[0].strip()
-                fullname = "{} {}".format(name, surname)
+            contribution_type = self.get_contribution_type(contribution_role)
+            if contribution_type is None:
+                logging.error("Unrecognised contributor role, skipping %s: %s", contributor, contribution_role)
+                continue
+            name, surname, fullname = self.split_name(contributor)
             contributor = {
                 "firstName": name,
                 "lastName": surname,
@@ -202,22 +201,31 @@ class WHPLoader(BookLoader):
                 "website": None
 
             }
-            if fullname not in self.all_contributors:
-                contributor_id = self.thoth.create_contributor(
-                    contributor)
-                self.all_contributors[fullname] = contributor_id
-            else:
-                contributor_id = self.all_contributors[fullname]
-
-            contribution = {
+            parsed.append((index + 1, contributor, contribution_type))
+        return parsed
+
+    def create_contributors(self, row, work_id):
+        """Creates all contributions associated with the current work
+
+        row: current CSV row
+
+        work_id: previously obtained ID of the current work
+        """
+        contributions = []
+        for ordinal, contributor, contribution_type in self.get_contributors(row):
+            # contributors are normally created up front in run; this only creates stragglers
+            contributor_id = self.resolve_contributor(contributor["fullName"], None, lambda: contributor)
+
+            contributions.append({
                 "workId": work_id,
                 "contributorId": contributor_id,
-                "contributionType": self.contribution_types[contribution_role],
+                "contributionType": contribution_type,
                 "mainContribution": "true",
-                "contributionOrdinal": index + 1,
+                "contributionOrdinal": ordinal,
                 "biography": None,
-                "firstName": name,
-                "lastName": surname,
-                "fullName": fullname,
-            }
-            self.thoth.create_contribution(contribution)
+                "firstName": contributor["firstName"],
+                "lastName": contributor["lastName"],
+                "fullName": contributor["fullName"],
+            })
+        # create all of the work's contributions in a single request
+        self.mutate_batch([("createContribution", contribution) for contribution in contributions])